@@ -0,0 +1,132 @@
+"""Shared Playwright browser for the debug scripts.
+
+Launching Chromium is the slowest part of every debug run, so the scripts
+share a single browser and open a fresh context per URL instead.
+"""
+import asyncio
+import os
+from typing import Any, Iterable, Optional, Tuple, Union
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+
+_playwright: Optional[Any] = None  # Playwright instance
+_browser: Optional[Browser] = None
+_lock = asyncio.Lock()
+
+# Elements the debug scripts actually look at
+READY_SELECTOR = "table, a[href*='/musor/']"
+
+# Saved cookies/localStorage (cookie consent) reused across runs
+STATE_PATH = os.getenv("MUSOR_STATE_PATH", "/tmp/musor_state.json")
+
+# Resource types that don't affect the markup we inspect
+HEAVY_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Third-party analytics/ad hosts whose scripts can be skipped when dumping HTML
+TRACKER_HOSTS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+)
+
+
+async def get_browser(headless: bool = True) -> Browser:
+    """Get or launch the shared browser instance.
+
+    Args:
+        headless: Only honoured on the first call, which launches the browser
+
+    Returns:
+        Shared Browser instance
+    """
+    global _playwright, _browser
+
+    async with _lock:
+        if _browser is None:
+            _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=headless, args=["--no-sandbox"])
+        return _browser
+
+
+async def close_browser() -> None:
+    """Close the shared browser and stop Playwright."""
+    global _playwright, _browser
+
+    async with _lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+
+
+async def new_context(browser: Browser) -> Tuple[BrowserContext, bool]:
+    """Open a browser context, restoring saved cookie consent if available.
+
+    Returns:
+        (context, warm) - warm is True when a saved storage state was loaded,
+        in which case the cookie banner can be skipped
+    """
+    warm = os.path.exists(STATE_PATH)
+    context = await browser.new_context(storage_state=STATE_PATH if warm else None)
+    return context, warm
+
+
+async def ready(page: Page) -> None:
+    """Wait until the listing markup the debug scripts inspect is present.
+
+    Used instead of ``networkidle``, which often fires seconds after the
+    schedule tables are rendered (or never, with ads polling).
+    """
+    await page.wait_for_load_state("domcontentloaded")
+    try:
+        await page.wait_for_selector(READY_SELECTOR, timeout=8000)
+    except PlaywrightTimeoutError:
+        pass
+
+
+async def accept_cookies(page: Page, selector: str = 'button:has-text("Elfogadom")') -> bool:
+    """Click the cookie consent button if it shows up.
+
+    On success the context's storage state is saved to STATE_PATH so later
+    runs (see new_context) start with consent already given.
+
+    Returns:
+        True if the button was clicked
+    """
+    try:
+        await page.locator(selector).first.click(timeout=1500)
+    except PlaywrightTimeoutError:
+        return False
+    await page.context.storage_state(path=STATE_PATH)
+    return True
+
+
+async def block_resources(
+    target: Union[BrowserContext, Page],
+    resource_types: Iterable[str] = HEAVY_RESOURCE_TYPES,
+    blocked_hosts: Iterable[str] = (),
+) -> None:
+    """Abort requests for the given resource types and hosts.
+
+    Args:
+        target: Context or page to install the route on
+        resource_types: Playwright resource types to abort (image, font, ...)
+        blocked_hosts: URL substrings to abort regardless of resource type
+    """
+    types = frozenset(resource_types)
+    hosts = tuple(blocked_hosts)
+
+    async def _handle(route: Route) -> None:
+        request = route.request
+        if request.resource_type in types or any(h in request.url for h in hosts):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await target.route("**/*", _handle)
@@ -1,25 +1,69 @@
-"""Debug script to inspect musor.tv HTML structure."""
+"""Debug script to inspect musor.tv HTML structure.
+
+Usage:
+    python debug/debug_selectors.py [--screenshot]
+"""
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser
+from _browser_pool import (
+    get_browser, close_browser, new_context, ready, accept_cookies, block_resources, HEAVY_RESOURCE_TYPES
+)
+
+
+# Probe every selector in one round-trip: count + first element's class/text
+PROBE_SELECTORS_JS = """sels => sels.map(s => {
+    const els = document.querySelectorAll(s);
+    return {
+        sel: s,
+        count: els.length,
+        cls: els.length ? els[0].getAttribute("class") : null,
+        text: els.length ? (els[0].textContent || "").trim().slice(0, 100) : null,
+    };
+})"""
 
+# First matching content container and its innerHTML, in one round-trip
+FIRST_CONTAINER_JS = """sels => {
+    for (const s of sels) {
+        const els = document.querySelectorAll(s);
+        if (els.length) return {sel: s, count: els.length, html: els[0].innerHTML};
+    }
+    return null;
+}"""
 
-async def inspect_page(url: str):
-    """Inspect page structure to find correct selectors."""
-    print(f"\n{'='*80}")
-    print(f"Inspecting: {url}")
-    print('='*80)
+
+async def inspect_page(browser: Browser, url: str, screenshot: bool = False):
+    """Inspect page structure to find correct selectors.
+    
+    Output is buffered and printed in one go, so pages inspected
+    concurrently don't interleave their reports.
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=["--no-sandbox"])
-        page = await browser.new_page()
+    Args:
+        browser: Shared browser; each call gets its own isolated context
+        url: Page to inspect
+        screenshot: Save a full-page screenshot (slow on long schedule pages)
+    """
+    lines = []
+    log = lines.append
+    
+    log(f"\n{'='*80}")
+    log(f"Inspecting: {url}")
+    log('='*80)
+    
+    context, warm = await new_context(browser)
+    # Keep images/CSS only when a screenshot is requested
+    await block_resources(context, {"font", "media"} if screenshot else HEAVY_RESOURCE_TYPES)
+    page = await context.new_page()
+    
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        await ready(page)
         
-        try:
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Try to accept cookies - try multiple selectors
+        # Try to accept cookies - any of these selectors (locator click auto-waits)
+        if warm:
+            log("✓ Cookie consent restored from saved state")
+        else:
             try:
-                await asyncio.sleep(1)  # Wait for cookie dialog to appear
-                
                 cookie_selectors = [
                     'button:has-text("Elfogadom")',
                     'button:has-text("Accept")',
@@ -29,101 +73,81 @@ async def inspect_page(url: str):
                     '.qc-cmp2-summary-buttons button'
                 ]
                 
-                clicked = False
-                for selector in cookie_selectors:
-                    try:
-                        btn = page.locator(selector).first
-                        if await btn.count() > 0:
-                            await btn.click(timeout=2000)
-                            print(f"✓ Cookie accepted via: {selector}")
-                            clicked = True
-                            await asyncio.sleep(2)  # Wait for content to load
-                            break
-                    except:
-                        continue
-                
-                if not clicked:
-                    print("- No cookie button found")
+                if await accept_cookies(page, ", ".join(cookie_selectors)):
+                    log("✓ Cookie accepted")
+                    await ready(page)  # Wait for content to load
+                else:
+                    log("- No cookie button found")
             except Exception as e:
-                print(f"- Cookie handling error: {e}")
-            
-            # Get page title
-            title = await page.title()
-            print(f"\nPage title: {title}")
-            
-            # Try different common selectors
-            selectors = [
-                "article",
-                "div[class*='card']",
-                "div[class*='program']",
-                "div[class*='item']",
-                "div[class*='show']",
-                "div[class*='movie']",
-                "li[class*='program']",
-                "li[class*='item']",
-                ".broadcast",
-                "[data-program]",
-                "[data-broadcast]",
-            ]
-            
-            print("\nTesting selectors:")
-            for selector in selectors:
-                count = await page.locator(selector).count()
-                if count > 0:
-                    print(f"  ✓ {selector}: {count} elements")
-                    
-                    # Get first element details
-                    if count > 0:
-                        first = page.locator(selector).first
-                        classes = await first.get_attribute("class")
-                        print(f"    Classes: {classes}")
-                        
-                        # Try to find title/text
-                        text = await first.text_content()
-                        if text:
-                            text_preview = text.strip()[:100]
-                            print(f"    Text preview: {text_preview}...")
-                        break
-            
-            # Wait a bit more for dynamic content
-            await asyncio.sleep(3)
-            
-            # Get body HTML snippet - look for main content area
-            print("\n\nLooking for main content containers...")
-            content_selectors = ["main", "#content", "#main", ".content", ".main", "div[id*='app']", "div[class*='container']"]
-            for sel in content_selectors:
-                count = await page.locator(sel).count()
-                if count > 0:
-                    print(f"  Found: {sel} ({count} elements)")
-                    try:
-                        html = await page.locator(sel).first.evaluate("el => el.innerHTML")
-                        print(f"  Content preview (first 1000 chars):")
-                        print(html[:1000])
-                        print("\n  ... (truncated)\n")
-                        break
-                    except:
-                        pass
-            
-            # Take a screenshot for manual inspection
+                log(f"- Cookie handling error: {e}")
+        
+        # Get page title
+        title = await page.title()
+        log(f"\nPage title: {title}")
+        
+        # Try different common selectors
+        selectors = [
+            "article",
+            "div[class*='card']",
+            "div[class*='program']",
+            "div[class*='item']",
+            "div[class*='show']",
+            "div[class*='movie']",
+            "li[class*='program']",
+            "li[class*='item']",
+            ".broadcast",
+            "[data-program]",
+            "[data-broadcast]",
+        ]
+        
+        log("\nTesting selectors:")
+        for probe in await page.evaluate(PROBE_SELECTORS_JS, selectors):
+            if probe["count"] > 0:
+                log(f"  ✓ {probe['sel']}: {probe['count']} elements")
+                log(f"    Classes: {probe['cls']}")
+                if probe["text"]:
+                    log(f"    Text preview: {probe['text']}...")
+                break
+        
+        # Get body HTML snippet - look for main content area
+        log("\n\nLooking for main content containers...")
+        content_selectors = ["main", "#content", "#main", ".content", ".main", "div[id*='app']", "div[class*='container']"]
+        container = await page.evaluate(FIRST_CONTAINER_JS, content_selectors)
+        if container:
+            log(f"  Found: {container['sel']} ({container['count']} elements)")
+            log(f"  Content preview (first 1000 chars):")
+            log(container["html"][:1000])
+            log("\n  ... (truncated)\n")
+        
+        # Take a screenshot for manual inspection
+        if screenshot:
             screenshot_path = f"/tmp/musor_debug_{url.split('/')[-1]}.png"
             await page.screenshot(path=screenshot_path, full_page=True)
-            print(f"\n📸 Screenshot saved to: {screenshot_path}")
-            
-        except Exception as e:
-            print(f"ERROR: {e}")
-        finally:
-            await browser.close()
+            log(f"\n📸 Screenshot saved to: {screenshot_path}")
+        
+    except Exception as e:
+        log(f"ERROR: {e}")
+    finally:
+        await context.close()
+        print("\n".join(lines))
 
 
 async def main():
     """Run inspection on both pages."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screenshot", action="store_true", help="save full-page screenshots to /tmp")
+    args = parser.parse_args()
+    
     pages = [
         "https://musor.tv/most/tvben",
         "https://musor.tv/filmek"
     ]
     
-    for url in pages:
-        await inspect_page(url)
+    try:
+        browser = await get_browser()
+        await asyncio.gather(*(inspect_page(browser, url, args.screenshot) for url in pages))
+    finally:
+        await close_browser()
 
 
 if __name__ == "__main__":
@@ -1,100 +1,131 @@
-"""Debug script v2 - Find actual program elements."""
+"""Debug script v2 - Find actual program elements.
+
+Usage:
+    python debug/debug_selectors_v2.py [--pause SECONDS]
+"""
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
+from _browser_pool import get_browser, close_browser, new_context, ready, accept_cookies, block_resources
+
+
+# Count + details of the first 3 matches for every selector in one round-trip
+PROBE_SELECTORS_JS = """sels => sels.map(s => {
+    const els = Array.from(document.querySelectorAll(s));
+    return {
+        sel: s,
+        count: els.length,
+        items: els.slice(0, 3).map(el => ({
+            cls: el.getAttribute("class"),
+            href: el.getAttribute("href"),
+            text: el.textContent,
+        })),
+    };
+})"""
+
+# [href, text] of the first 50 links
+FIRST_LINKS_JS = """() => {
+    const links = document.querySelectorAll("a");
+    return {
+        total: links.length,
+        items: Array.from(links).slice(0, 50).map(a => [a.getAttribute("href"), a.textContent]),
+    };
+}"""
 
 
-async def find_programs(url: str):
-    """Find actual program/show elements."""
+async def find_programs(url: str, pause: int = 0):
+    """Find actual program/show elements.
+    
+    Args:
+        url: Page to analyze
+        pause: Seconds to keep a visible browser window open afterwards (0 = headless, no pause)
+    """
     print(f"\n{'='*80}")
     print(f"Analyzing: {url}")
     print('='*80)
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False, args=["--no-sandbox"])  # headless=False to see what's happening
-        page = await browser.new_page()
+    browser = await get_browser(headless=not pause)  # visible window only when pausing to inspect
+    context, warm = await new_context(browser)
+    # Keep CSS so the visible window is still readable
+    await block_resources(context, {"image", "font", "media"})
+    page = await context.new_page()
+    
+    try:
+        print("Loading page...")
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        await ready(page)
+        
+        # Handle cookies
+        if not warm and await accept_cookies(page):
+            print("✓ Cookie accepted")
+            await ready(page)
+        
+        # Look for tables (musor.tv likely uses tables for TV schedules)
+        print("\nLooking for tables...")
+        table_count = await page.locator("table").count()
+        print(f"Found {table_count} tables")
         
-        try:
-            print("Loading page...")
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Handle cookies
-            await asyncio.sleep(1)
-            try:
-                btn = page.locator('button:has-text("Elfogadom")').first
-                if await btn.count() > 0:
-                    await btn.click()
-                    print("✓ Cookie accepted")
-                    await asyncio.sleep(3)
-            except:
-                pass
-            
-            # Look for tables (musor.tv likely uses tables for TV schedules)
-            print("\nLooking for tables...")
-            tables = page.locator("table")
-            table_count = await tables.count()
-            print(f"Found {table_count} tables")
-            
-            # Look for program-related elements
-            print("\nSearching for program elements...")
-            program_selectors = [
-                "tr[class*='program']",
-                "tr[class*='show']",
-                "tr[class*='event']",
-                "div[class*='program']",
-                "div[class*='broadcast']",
-                "a[href*='/musor/']",
-                "a[href*='musor']",
-            ]
-            
-            for sel in program_selectors:
-                count = await page.locator(sel).count()
-                if count > 0:
-                    print(f"\n✓ Found {count} elements with selector: {sel}")
-                    
-                    # Get details of first 3 elements
-                    for i in range(min(3, count)):
-                        elem = page.locator(sel).nth(i)
-                        text = await elem.text_content()
-                        classes = await elem.get_attribute("class")
-                        href = await elem.get_attribute("href")
-                        print(f"  [{i}] Classes: {classes}")
-                        if href:
-                            print(f"      Href: {href}")
-                        print(f"      Text: {text[:100] if text else 'N/A'}...")
-            
-            # Get all links and filter for program links
-            print("\n\nAnalyzing all links...")
-            links = page.locator("a")
-            link_count = await links.count()
-            print(f"Total links: {link_count}")
-            
-            program_links = []
-            for i in range(min(50, link_count)):
-                href = await links.nth(i).get_attribute("href")
-                text = await links.nth(i).text_content()
-                if href and ("/musor/" in href or "channel" in href.lower()):
-                    program_links.append((href, text))
-            
-            if program_links:
-                print(f"\nFound {len(program_links)} program-related links:")
-                for href, text in program_links[:10]:
-                    print(f"  {href} - {text[:50] if text else 'N/A'}")
-            
-            # Keep browser open for manual inspection
-            print("\n\n⏸️  Browser window kept open for 30 seconds for manual inspection...")
-            await asyncio.sleep(30)
-            
-        except Exception as e:
-            print(f"ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            await browser.close()
+        # Look for program-related elements
+        print("\nSearching for program elements...")
+        program_selectors = [
+            "tr[class*='program']",
+            "tr[class*='show']",
+            "tr[class*='event']",
+            "div[class*='program']",
+            "div[class*='broadcast']",
+            "a[href*='/musor/']",
+            "a[href*='musor']",
+        ]
+        
+        for probe in await page.evaluate(PROBE_SELECTORS_JS, program_selectors):
+            if probe["count"] > 0:
+                print(f"\n✓ Found {probe['count']} elements with selector: {probe['sel']}")
+                
+                # Details of first 3 elements
+                for i, item in enumerate(probe["items"]):
+                    text = item["text"]
+                    print(f"  [{i}] Classes: {item['cls']}")
+                    if item["href"]:
+                        print(f"      Href: {item['href']}")
+                    print(f"      Text: {text[:100] if text else 'N/A'}...")
+        
+        # Get all links and filter for program links
+        print("\n\nAnalyzing all links...")
+        links = await page.evaluate(FIRST_LINKS_JS)
+        print(f"Total links: {links['total']}")
+        
+        program_links = [
+            (href, text) for href, text in links["items"]
+            if href and ("/musor/" in href or "channel" in href.lower())
+        ]
+        
+        if program_links:
+            print(f"\nFound {len(program_links)} program-related links:")
+            for href, text in program_links[:10]:
+                print(f"  {href} - {text[:50] if text else 'N/A'}")
+        
+        # Keep browser open for manual inspection
+        if pause:
+            print(f"\n\n⏸️  Browser window kept open for {pause} seconds for manual inspection...")
+            await asyncio.sleep(pause)
+        
+    except Exception as e:
+        print(f"ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await context.close()
 
 
 async def main():
     """Run analysis."""
-    await find_programs("https://musor.tv/filmek")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pause", type=int, default=0, help="keep a visible browser open for N seconds")
+    args = parser.parse_args()
+    
+    try:
+        await find_programs("https://musor.tv/filmek", args.pause)
+    finally:
+        await close_browser()
 
 
 if __name__ == "__main__":
@@ -9,36 +9,44 @@ Usage:
 Example:
     python debug/validate_stream_endpoint.py http://localhost:7000
 """
+import asyncio
 import sys
-import json
-import urllib.request
-import urllib.error
+from typing import Any, Optional, Tuple
+import httpx
+import orjson
 
 
-def test_endpoint(base_url: str, endpoint: str, description: str) -> bool:
-    """Test a single endpoint and print results."""
-    url = f"{base_url}{endpoint}"
-    print(f"\n🧪 Testing: {description}")
-    print(f"   URL: {url}")
+async def fetch_endpoint(client: httpx.AsyncClient, endpoint: str) -> Tuple[Optional[int], Any, Optional[str]]:
+    """Fetch a single endpoint.
     
+    Returns:
+        (status, parsed JSON body, error message)
+    """
     try:
-        with urllib.request.urlopen(url) as response:
-            status = response.status
-            data = json.loads(response.read().decode())
-            
-            print(f"   ✅ Status: {status}")
-            print(f"   📦 Response: {json.dumps(data, indent=2)}")
-            return True
-            
-    except urllib.error.HTTPError as e:
-        print(f"   ❌ HTTP Error {e.code}: {e.reason}")
-        return False
+        response = await client.get(endpoint)
+        if response.is_error:
+            return response.status_code, None, f"HTTP Error {response.status_code}: {response.reason_phrase}"
+        return response.status_code, orjson.loads(response.content), None
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        return None, None, f"Error: {e}"
+
+
+def report_endpoint(base_url: str, endpoint: str, description: str, outcome: Tuple[Optional[int], Any, Optional[str]]) -> bool:
+    """Print results for a single endpoint."""
+    status, data, error = outcome
+    print(f"\n🧪 Testing: {description}")
+    print(f"   URL: {base_url}{endpoint}")
+    
+    if error:
+        print(f"   ❌ {error}")
         return False
+    
+    print(f"   ✅ Status: {status}")
+    print(f"   📦 Response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
+    return True
 
 
-def main():
+async def main():
     """Run all validation tests."""
     base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:7000"
     
@@ -54,9 +62,13 @@ def main():
         ("/healthz", "Health check endpoint"),
     ]
     
+    # One keep-alive client; all endpoints are hit concurrently
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        outcomes = await asyncio.gather(*[fetch_endpoint(client, endpoint) for endpoint, _ in tests])
+    
     results = []
-    for endpoint, description in tests:
-        result = test_endpoint(base_url, endpoint, description)
+    for (endpoint, description), outcome in zip(tests, outcomes):
+        result = report_endpoint(base_url, endpoint, description, outcome)
         results.append((description, result))
     
     print("\n" + "=" * 70)
@@ -77,27 +89,24 @@ def main():
     print("🔍 Manifest Validation")
     print("=" * 70)
     
-    try:
-        with urllib.request.urlopen(f"{base_url}/manifest.json") as response:
-            manifest = json.loads(response.read().decode())
-            
-            print(f"ID: {manifest.get('id')}")
-            print(f"Name: {manifest.get('name')}")
-            print(f"Version: {manifest.get('version')}")
-            print(f"Resources: {manifest.get('resources')}")
+    _, manifest, error = outcomes[0]
+    if error:
+        print(f"❌ Could not validate manifest: {error}")
+    else:
+        print(f"ID: {manifest.get('id')}")
+        print(f"Name: {manifest.get('name')}")
+        print(f"Version: {manifest.get('version')}")
+        print(f"Resources: {manifest.get('resources')}")
+        
+        if "stream" in manifest.get("resources", []):
+            print("\n✅ Stream resource is declared in manifest")
+        else:
+            print("\n❌ WARNING: Stream resource NOT declared in manifest")
             
-            if "stream" in manifest.get("resources", []):
-                print("\n✅ Stream resource is declared in manifest")
-            else:
-                print("\n❌ WARNING: Stream resource NOT declared in manifest")
-                
-            if "catalog" in manifest.get("resources", []):
-                print("✅ Catalog resource is declared in manifest")
-            else:
-                print("❌ WARNING: Catalog resource NOT declared in manifest")
-                
-    except Exception as e:
-        print(f"❌ Could not validate manifest: {e}")
+        if "catalog" in manifest.get("resources", []):
+            print("✅ Catalog resource is declared in manifest")
+        else:
+            print("❌ WARNING: Catalog resource NOT declared in manifest")
     
     print("\n" + "=" * 70)
     
@@ -106,4 +115,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 """Simple cache implementation using cachetools TTLCache."""
+import asyncio
 import time
-from typing import TypeVar, Generic, Optional
+from typing import TypeVar, Generic, Optional, Callable, Awaitable, Dict
 from cachetools import TTLCache
 
 
@@ -13,6 +14,7 @@ class Cache(Generic[T]):
     def __init__(self, ttl_ms: int):
         """Initialize cache with TTL in milliseconds."""
         self._cache: TTLCache = TTLCache(maxsize=64, ttl=ttl_ms / 1000.0)
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     def get(self, key: str) -> Optional[T]:
         """Get value from cache."""
@@ -25,6 +27,43 @@ class Cache(Generic[T]):
     def has(self, key: str) -> bool:
         """Check if key exists in cache."""
         return key in self._cache
+    
+    async def get_or_compute(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Get value from cache, computing it once on a miss.
+        
+        Concurrent misses for the same key share a single in-flight
+        computation instead of each running the factory. Falsy results
+        (e.g. an empty catalog) are returned but not cached, so the next
+        request retries.
+        
+        Args:
+            key: Cache key
+            factory: Zero-argument callable returning an awaitable value
+            
+        Returns:
+            Cached or freshly computed value
+        """
+        value = self._cache.get(key)
+        if value:
+            return value
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, factory))
+            self._inflight[key] = task
+        
+        # Shield so one cancelled caller doesn't cancel the shared computation
+        return await asyncio.shield(task)
+    
+    async def _compute(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run the factory and store its result, clearing the in-flight entry."""
+        try:
+            value = await factory()
+            if value:
+                self._cache[key] = value
+            return value
+        finally:
+            self._inflight.pop(key, None)
 
 
 def create_cache(ttl_ms: int) -> Cache:
@@ -1,13 +1,14 @@
 """Catalog handler for Stremio addon."""
+import asyncio
 import os
 import logging
-from datetime import datetime
-from typing import Any, Optional, Dict, List
+from functools import lru_cache
+from typing import Any, Optional, Dict, List, Tuple
 from cache import create_cache
-from time_window import compute_window, within_window
+from time_window import TimeWindow, compute_window, epoch_bounds
 from scraper import fetch_live_movies
-from utils import is_probably_film, slugify, strip_diacritics
-from models import CatalogExtra, StremioMetaPreview
+from utils import extract_year, is_probably_film, strip_diacritics
+from models import CatalogExtra, LiveMovieRaw, StremioMetaPreview
 from imdb_lookup import lookup_imdb_data, is_lookup_enabled
 
 
@@ -15,7 +16,37 @@ logger = logging.getLogger(__name__)
 
 CACHE_TTL_MIN = int(os.getenv("CACHE_TTL_MIN", "10")) * 60_000
 
-# Cache for meta previews derived from scraper
+# Max concurrent IMDb lookups while building a catalog
+IMDB_LOOKUP_CONCURRENCY = 8
+
+# Hungarian genre keyword -> display name, checked in order (first match wins)
+_GENRE_MAP = {
+    "akció": "Akció",
+    "vígjáték": "Vígjáték",
+    "dráma": "Dráma",
+    "thriller": "Thriller",
+    "horror": "Horror",
+}
+
+
+class CatalogEntry:
+    """Cached catalog build: meta dicts plus their search keys (same order)
+    and an ID index (first meta wins for repeated IDs)."""
+    __slots__ = ("metas", "search_keys", "by_id")
+    
+    def __init__(self, metas: List[Dict[str, Any]], search_keys: List[str]):
+        self.metas = metas
+        self.search_keys = search_keys
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        for m in metas:
+            self.by_id.setdefault(m["id"], m)
+    
+    def __bool__(self) -> bool:
+        # An empty catalog counts as a miss, so it is retried rather than cached
+        return bool(self.metas)
+
+
+# Cache for meta previews derived from scraper (already dumped to dicts)
 _cache = create_cache(CACHE_TTL_MIN)
 
 
@@ -25,131 +56,162 @@ async def catalog_handler(type_: str, id_: str, extra: Optional[Dict[str, Any]]
         return {"metas": []}
     
     q: Dict[str, Any] = extra or {}
-    time_window = compute_window(q.get("time"))
-    cache_key = f"catalog:{q.get('time', 'now')}"
+    entry = await _get_entry(q.get("time"))
+    if entry is None:
+        # Return empty list on scraper failure
+        return {"metas": []}
+    
+    # Search filter (accent-insensitive) against the prebuilt search keys
+    search = q.get("search", "").strip()
+    if search:
+        needle = strip_diacritics(search).lower()
+        return {"metas": [m for m, key in zip(entry.metas, entry.search_keys) if needle in key]}
+    
+    return {"metas": entry.metas}
+
+
+async def find_catalog_meta(meta_id: str) -> Optional[Dict[str, Any]]:
+    """Find a meta preview in the default ("now") catalog by its ID.
     
-    logger.info(f"Fetching catalog for time window: {q.get('time', 'now')}")
+    Args:
+        meta_id: Meta ID as listed in the catalog (e.g. an IMDb ID)
+        
+    Returns:
+        Meta preview dict, or None if the catalog doesn't list it
+    """
+    entry = await _get_entry(None)
+    return entry.by_id.get(meta_id) if entry is not None else None
+
+
+async def _get_entry(time_preset: Optional[str]) -> Optional[CatalogEntry]:
+    """Get the cached catalog build for a time preset, building it on a miss.
+    
+    Returns:
+        CatalogEntry (possibly empty), or None if the build failed
+    """
+    preset = time_preset or "now"
+    cache_key = f"catalog:{preset}"
     
-    metas = _cache.get(cache_key)
+    logger.info("Fetching catalog for time window: %s", preset)
     
-    if not metas:
+    entry = _cache.get(cache_key)
+    
+    if not entry:
         logger.info("Cache miss, fetching live movies...")
         try:
-            raw = await fetch_live_movies(False)
-            logger.info(f"Fetched {len(raw)} raw items from scraper")
-            
-            filtered = [
-                r for r in raw
-                if is_probably_film(r.category) and within_window(r.start_iso, time_window)
-            ]
-            logger.info(f"Filtered to {len(filtered)} movies in time window")
-            
-            metas = []
-            successful_imdb_lookups = 0
-            
-            for r in filtered:
-                start_time = datetime.fromisoformat(r.start_iso.replace("Z", "+00:00"))
-                timestamp = int(start_time.timestamp())
-                
-                # Try IMDb lookup if enabled
-                imdb_id = None
-                imdb_poster = None
-                if is_lookup_enabled():
-                    # Extract year from title if available (common format: "Title (2020)")
-                    year = None
-                    if r.category and "," in r.category:
-                        parts = r.category.split(",")
-                        for part in parts:
-                            # Look for 4-digit year
-                            clean_part = part.strip()
-                            if clean_part.isdigit() and len(clean_part) == 4:
-                                year = int(clean_part)
-                                break
-                    
-                    imdb_data = await lookup_imdb_data(r.title, year)
-                    if imdb_data:
-                        imdb_id = imdb_data.get("imdb_id")
-                        imdb_poster = imdb_data.get("poster_url")
-                        if imdb_id:
-                            successful_imdb_lookups += 1
-                
-                # Choose ID strategy: IMDb ID if found, otherwise custom musortv ID
-                if imdb_id:
-                    meta_id = imdb_id
-                    logger.debug(f"Using IMDb ID {imdb_id} for '{r.title}'")
-                else:
-                    meta_id = f"musortv:{slugify(r.channel)}:{timestamp}:{slugify(r.title)}"
-                    logger.debug(f"Using custom ID for '{r.title}' (no IMDb match)")
-                
-                # Use IMDb poster if available, otherwise fall back to original
-                poster = imdb_poster if imdb_poster else r.poster
-                
-                genres = _parse_genres(r.category)
-                
-                # Enhanced description for better context
-                time_str = _fmt_time(r.start_iso)
-                description = f"📺 {r.channel} • {time_str}"
-                if r.category:
-                    description += f" • {r.category}"
-                
-                metas.append(StremioMetaPreview(
-                    id=meta_id,
-                    type="movie",
-                    name=r.title,
-                    release_info=f"{time_str} • {r.channel}",
-                    poster=poster,
-                    genres=genres,
-                    description=description
-                ))
-            
-            if is_lookup_enabled():
-                logger.info(
-                    f"IMDb lookup success rate: {successful_imdb_lookups}/{len(filtered)} "
-                    f"({successful_imdb_lookups * 100 / len(filtered):.1f}%)"
-                )
-            
-            logger.info(f"Created {len(metas)} meta previews")
-            _cache.set(cache_key, metas)
+            # Window is only needed to build; concurrent misses share one build
+            time_window = compute_window(time_preset)
+            entry = await _cache.get_or_compute(cache_key, lambda: _build_metas(time_window))
         except Exception as e:
             logger.error(f"Failed to fetch and process movies: {e}", exc_info=True)
-            # Return empty list on scraper failure
-            metas = []
+            return None
     else:
-        logger.info(f"Cache hit, returning {len(metas)} metas")
+        logger.info(f"Cache hit, returning {len(entry.metas)} metas")
     
-    # Search filter (accent-insensitive)
-    search = q.get("search", "").strip()
-    if search:
-        needle = strip_diacritics(search).lower()
-        metas = [m for m in metas if needle in strip_diacritics(m.name).lower()]
+    return entry
+
+
+async def _build_metas(time_window: TimeWindow) -> CatalogEntry:
+    """Scrape, filter and convert live movies into catalog meta dicts."""
+    raw = await fetch_live_movies(False)
+    logger.info(f"Fetched {len(raw)} raw items from scraper")
+    
+    lo, hi = epoch_bounds(time_window)
+    filtered = [
+        r for r in raw
+        if is_probably_film(r.category) and lo <= r.start_ts <= hi
+    ]
+    logger.info(f"Filtered to {len(filtered)} movies in time window")
+    
+    # Try IMDb lookup if enabled
+    lookup_enabled = is_lookup_enabled()
+    if lookup_enabled:
+        imdb_results = await _lookup_all(filtered)
+    else:
+        imdb_results = [None] * len(filtered)
+    
+    # Cache plain dicts so cache hits skip Pydantic serialization
+    metas = [
+        _to_meta_preview(r, imdb_data).model_dump()
+        for r, imdb_data in zip(filtered, imdb_results)
+    ]
+    
+    if lookup_enabled and filtered:
+        successful_imdb_lookups = sum(
+            1 for d in imdb_results if d and d.get("imdb_id")
+        )
+        logger.info(
+            f"IMDb lookup success rate: {successful_imdb_lookups}/{len(filtered)} "
+            f"({successful_imdb_lookups * 100 / len(filtered):.1f}%)"
+        )
+    
+    logger.info(f"Created {len(metas)} meta previews")
+    return CatalogEntry(metas, [_search_key(m["name"]) for m in metas])
+
+
+async def _lookup_all(rows: List[LiveMovieRaw]) -> List[Optional[Dict[str, Any]]]:
+    """Run IMDb lookups for all rows concurrently, bounded by a semaphore."""
+    sem = asyncio.Semaphore(IMDB_LOOKUP_CONCURRENCY)
+    
+    async def _one(r: LiveMovieRaw) -> Optional[Dict[str, Any]]:
+        async with sem:
+            return await lookup_imdb_data(r.title, extract_year(r.category))
+    
+    return await asyncio.gather(*(_one(r) for r in rows))
+
+
+def _to_meta_preview(r: LiveMovieRaw, imdb_data: Optional[Dict[str, Any]]) -> StremioMetaPreview:
+    """Build a catalog meta preview from a scraped row and optional IMDb data."""
+    imdb_id = imdb_data.get("imdb_id") if imdb_data else None
+    imdb_poster = imdb_data.get("poster_url") if imdb_data else None
+    
+    # Choose ID strategy: IMDb ID if found, otherwise custom musortv ID
+    # (per-row debug logs use lazy %-args so nothing is formatted at INFO)
+    if imdb_id:
+        meta_id = imdb_id
+        logger.debug("Using IMDb ID %s for '%s'", imdb_id, r.title)
+    else:
+        meta_id = f"musortv:{r.channel_slug}:{r.start_ts}:{r.title_slug}"
+        logger.debug("Using custom ID for '%s' (no IMDb match)", r.title)
+    
+    # Enhanced description for better context
+    time_str = r.time_str
+    description = f"📺 {r.channel} • {time_str}"
+    if r.category:
+        description += f" • {r.category}"
     
-    # Convert Pydantic models to dicts
-    return {"metas": [m.model_dump() for m in metas]}
+    # Every field is built from already-clean scraper/IMDb strings, so skip
+    # per-row Pydantic validation
+    return StremioMetaPreview.model_construct(
+        id=meta_id,
+        type="movie",
+        name=r.title,
+        release_info=f"{time_str} • {r.channel}",
+        # Use IMDb poster if available, otherwise fall back to original
+        poster=imdb_poster or r.poster,
+        genres=list(_parse_genres(r.category)) if r.category else None,
+        description=description
+    )
 
 
-def _parse_genres(category: Optional[str]) -> Optional[List[str]]:
-    """Parse and map Hungarian genre names."""
-    if not category:
-        return None
+@lru_cache(maxsize=512)
+def _parse_genres(category: str) -> Tuple[str, ...]:
+    """Parse and map Hungarian genre names.
     
+    Memoized: the same category string repeats across channels and refreshes.
+    Returns a tuple so the cached value can't be mutated by callers.
+    """
     base = category.split(",")[0] if "," in category else category
     lc = base.lower()
     
-    if "akció" in lc:
-        return ["Akció"]
-    if "vígjáték" in lc:
-        return ["Vígjáték"]
-    if "dráma" in lc:
-        return ["Dráma"]
-    if "thriller" in lc:
-        return ["Thriller"]
-    if "horror" in lc:
-        return ["Horror"]
+    for key, value in _GENRE_MAP.items():
+        if key in lc:
+            return (value,)
     
-    return [base.strip()]
+    return (base.strip(),)
 
 
-def _fmt_time(iso: str) -> str:
-    """Format ISO datetime to HH:MM format."""
-    d = datetime.fromisoformat(iso.replace("Z", "+00:00"))
-    return d.strftime("%H:%M")
+@lru_cache(maxsize=1024)
+def _search_key(name: str) -> str:
+    """Accent-insensitive, lowercased form of a meta name for search matching."""
+    return strip_diacritics(name).lower()
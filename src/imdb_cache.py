@@ -1,13 +1,14 @@
 """Caching layer for IMDb ID lookups.
 
-This module provides a TTL-based cache for IMDb lookups to reduce
-API calls to TMDB and improve performance.
+This module provides an LRU cache with per-entry expiry for IMDb lookups
+to reduce API calls to TMDB and improve performance.
 """
 import os
+import time
 import logging
-import hashlib
-from typing import Optional
-from cachetools import TTLCache
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from cachetools import TLRUCache
 from utils import strip_diacritics
 
 
@@ -18,13 +19,22 @@ logger = logging.getLogger(__name__)
 IMDB_CACHE_TTL_DAYS = int(os.getenv("IMDB_CACHE_TTL_DAYS", "7"))
 IMDB_CACHE_TTL_SECONDS = IMDB_CACHE_TTL_DAYS * 24 * 60 * 60
 IMDB_CACHE_MAX_SIZE = 1000
+# Failed lookups expire much sooner so transient errors/new releases are retried
+IMDB_NEG_TTL_SECONDS = int(os.getenv("IMDB_NEG_TTL_SECONDS", "3600"))
 
-# Global cache instance
-# Key: normalized title + year hash
-# Value: IMDb ID or None (to cache failed lookups)
-_imdb_cache: TTLCache = TTLCache(maxsize=IMDB_CACHE_MAX_SIZE, ttl=IMDB_CACHE_TTL_SECONDS)
 
+def _ttu(_key: Any, value: Optional[dict], now: float) -> float:
+    """Expiry time for a cache entry: failed lookups (None) expire sooner."""
+    return now + (IMDB_NEG_TTL_SECONDS if value is None else IMDB_CACHE_TTL_SECONDS)
 
+
+# Global cache instance; evicts least recently used entries when full
+# Key: (normalized title, year) tuple
+# Value: {"imdb_id", "poster_url"} dict or None (to cache failed lookups)
+_imdb_cache: TLRUCache = TLRUCache(maxsize=IMDB_CACHE_MAX_SIZE, ttu=_ttu, timer=time.monotonic)
+
+
+@lru_cache(maxsize=4096)
 def _normalize_title(title: str) -> str:
     """Normalize title for consistent cache keys.
     
@@ -36,10 +46,10 @@ def _normalize_title(title: str) -> str:
     Returns:
         Normalized title
     """
-    return strip_diacritics(title.lower().strip())
+    return strip_diacritics(title.strip().lower())
 
 
-def _cache_key(title: str, year: Optional[int] = None) -> str:
+def _cache_key(title: str, year: Optional[int] = None) -> Tuple[str, Optional[int]]:
     """Generate cache key from title and year.
     
     Args:
@@ -47,46 +57,69 @@ def _cache_key(title: str, year: Optional[int] = None) -> str:
         year: Release year (optional)
         
     Returns:
-        MD5 hash as cache key
+        (normalized title, year) tuple as cache key
     """
-    normalized = _normalize_title(title)
-    year_str = str(year) if year else ""
-    key_string = f"{normalized}:{year_str}"
-    return hashlib.md5(key_string.encode()).hexdigest()
+    return (_normalize_title(title), year or None)
 
 
-def get_cached_imdb_id(title: str, year: Optional[int] = None) -> Optional[str]:
-    """Get IMDb ID from cache.
+def get_cached_imdb_data(title: str, year: Optional[int] = None) -> Optional[Dict[str, Optional[str]]]:
+    """Get IMDb data (ID and poster URL) from cache.
     
     Args:
         title: Movie title
         year: Release year (optional)
         
     Returns:
-        Cached IMDb ID, None (if cached as not found), or KeyError (if not in cache)
+        Cached {"imdb_id", "poster_url"} dict, None (if cached as not found),
+        or raises KeyError (if not in cache)
     """
     key = _cache_key(title, year)
     
     try:
         value = _imdb_cache[key]
-        logger.debug(f"Cache HIT for '{title}' (year: {year}): {value}")
+        logger.debug("Cache HIT for '%s' (year: %s): %s", title, year, value)
         return value
     except KeyError:
-        logger.debug(f"Cache MISS for '{title}' (year: {year})")
+        logger.debug("Cache MISS for '%s' (year: %s)", title, year)
         raise
 
 
+def set_cached_imdb_data(title: str, year: Optional[int], data: Optional[Dict[str, Optional[str]]]) -> None:
+    """Store IMDb data in cache.
+    
+    Args:
+        title: Movie title
+        year: Release year (optional)
+        data: {"imdb_id", "poster_url"} dict to cache (or None to cache failed lookup)
+    """
+    key = _cache_key(title, year)
+    _imdb_cache[key] = data
+    logger.debug("Cached IMDb data for '%s' (year: %s): %s", title, year, data)
+
+
+def get_cached_imdb_id(title: str, year: Optional[int] = None) -> Optional[str]:
+    """Get IMDb ID from cache.
+    
+    Args:
+        title: Movie title
+        year: Release year (optional)
+        
+    Returns:
+        Cached IMDb ID, None (if cached as not found), or KeyError (if not in cache)
+    """
+    data = get_cached_imdb_data(title, year)
+    return data["imdb_id"] if data else None
+
+
 def set_cached_imdb_id(title: str, year: Optional[int], imdb_id: Optional[str]) -> None:
-    """Store IMDb ID in cache.
+    """Store IMDb ID (without poster) in cache.
     
     Args:
         title: Movie title
         year: Release year (optional)
         imdb_id: IMDb ID to cache (or None to cache failed lookup)
     """
-    key = _cache_key(title, year)
-    _imdb_cache[key] = imdb_id
-    logger.debug(f"Cached IMDb ID for '{title}' (year: {year}): {imdb_id}")
+    set_cached_imdb_data(title, year, {"imdb_id": imdb_id, "poster_url": None} if imdb_id else None)
 
 
 def clear_cache() -> None:
@@ -99,11 +132,15 @@ def get_cache_stats() -> dict:
     """Get cache statistics.
     
     Returns:
-        Dict with cache stats (size, maxsize, ttl)
+        Dict with cache stats (size, maxsize, ttl); size counts both
+        positive and negative entries
     """
+    _imdb_cache.expire()
     return {
         "size": len(_imdb_cache),
+        "negative_size": sum(1 for value in _imdb_cache.values() if value is None),
         "maxsize": _imdb_cache.maxsize,
         "ttl_days": IMDB_CACHE_TTL_DAYS,
         "ttl_seconds": IMDB_CACHE_TTL_SECONDS,
+        "negative_ttl_seconds": IMDB_NEG_TTL_SECONDS,
     }
@@ -7,12 +7,9 @@ import os
 import logging
 import asyncio
 from typing import Optional, Dict, List, Tuple, Any
-try:
-    import aiohttp
-except ImportError:
-    aiohttp = None  # Will be handled gracefully
-from utils import strip_diacritics
-from imdb_cache import get_cached_imdb_id, set_cached_imdb_id, get_cache_stats
+import aiohttp
+from aiolimiter import AsyncLimiter
+from imdb_cache import get_cached_imdb_data, set_cached_imdb_data, get_cache_stats, _cache_key
 
 
 logger = logging.getLogger(__name__)
@@ -27,67 +24,117 @@ IMDB_RATE_LIMIT_PER_SEC = int(os.getenv("IMDB_RATE_LIMIT_PER_SEC", "40"))
 # Detect if using Bearer token (JWT) or API key
 IS_BEARER_TOKEN = TMDB_API_KEY.startswith("eyJ") if TMDB_API_KEY else False
 
-# Rate limiting
-_rate_limit_semaphore = asyncio.Semaphore(IMDB_RATE_LIMIT_PER_SEC)
-_last_request_time = 0.0
+# Rate limiting: token bucket allowing IMDB_RATE_LIMIT_PER_SEC requests per second
+_tmdb_limiter = AsyncLimiter(max_rate=IMDB_RATE_LIMIT_PER_SEC, time_period=1.0)
 
+# Max simultaneous TMDB connections (TMDB allows ~20); bounds in-flight requests
+TMDB_MAX_CONCURRENCY = 20
 
-async def _rate_limited_request(url: str, params: Dict) -> Optional[Dict]:
+# Upper bound on how long we honour a 429 Retry-After before giving up
+MAX_RETRY_AFTER_SEC = 10
+
+# Shared HTTP session (keep-alive connection pool to TMDB), created lazily
+_session: Optional[aiohttp.ClientSession] = None
+
+# Lookups currently talking to TMDB, keyed by cache key, so concurrent
+# requests for the same (title, year) share one set of API calls
+_inflight: Dict[Tuple[str, Optional[int]], "asyncio.Task[Optional[Dict[str, Any]]]"] = {}
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get or create the shared TMDB client session.
+    
+    Must be called from within a running event loop.
+    
+    Returns:
+        aiohttp.ClientSession reused across all TMDB requests
+    """
+    global _session
+    
+    if _session is None or _session.closed:
+        headers = {}
+        if IS_BEARER_TOKEN:
+            # Use Bearer token in Authorization header
+            headers["Authorization"] = f"Bearer {TMDB_API_KEY}"
+        
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=TMDB_MAX_CONCURRENCY,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            ),
+            timeout=aiohttp.ClientTimeout(total=5),
+            headers=headers,
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared TMDB client session (call on application shutdown)."""
+    global _session
+    
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def _rate_limited_request(url: str, params: Dict, retry_on_429: bool = True) -> Optional[Dict]:
     """Make rate-limited HTTP request to TMDB API.
     
+    On a 429 response the request is retried once after the server's
+    Retry-After delay (capped at MAX_RETRY_AFTER_SEC).
+    
     Args:
         url: API endpoint URL
         params: Query parameters
+        retry_on_429: Whether a rate-limited request may be retried
         
     Returns:
         JSON response dict or None on error
     """
-    global _last_request_time
-    
-    async with _rate_limit_semaphore:
-        # Ensure we don't exceed rate limit
-        now = asyncio.get_event_loop().time()
-        time_since_last = now - _last_request_time
-        if time_since_last < (1.0 / IMDB_RATE_LIMIT_PER_SEC):
-            await asyncio.sleep((1.0 / IMDB_RATE_LIMIT_PER_SEC) - time_since_last)
-        
-        try:
-            # Prepare headers (Bearer token or API key in params)
-            headers = {}
-            request_params = params.copy()
-            
-            if IS_BEARER_TOKEN:
-                # Use Bearer token in Authorization header
-                headers["Authorization"] = f"Bearer {TMDB_API_KEY}"
-                # Remove api_key from params if present
-                request_params.pop("api_key", None)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, 
-                    params=request_params, 
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as resp:
-                    _last_request_time = asyncio.get_event_loop().time()
-                    
-                    if resp.status == 200:
-                        return await resp.json()
-                    elif resp.status == 429:
-                        logger.warning("TMDB rate limit exceeded")
-                        return None
-                    elif resp.status == 401:
-                        logger.error("TMDB API authentication failed - check API key")
-                        return None
-                    else:
-                        logger.warning(f"TMDB API returned status {resp.status}")
-                        return None
-        except asyncio.TimeoutError:
-            logger.warning("TMDB API request timed out")
-            return None
-        except Exception as e:
-            logger.error(f"TMDB API request failed: {e}")
-            return None
+    # Bearer token is sent via the session's Authorization header
+    request_params = params.copy()
+    if IS_BEARER_TOKEN:
+        # Remove api_key from params if present
+        request_params.pop("api_key", None)
+    
+    retry_after: Optional[float] = None
+    
+    try:
+        async with _tmdb_limiter:
+            session = _get_session()
+            async with session.get(url, params=request_params) as resp:
+                if resp.status == 200:
+                    return await resp.json()
+                elif resp.status == 429:
+                    logger.warning("TMDB rate limit exceeded")
+                    retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                elif resp.status == 401:
+                    logger.error("TMDB API authentication failed - check API key")
+                    return None
+                else:
+                    logger.warning(f"TMDB API returned status {resp.status}")
+                    return None
+    except asyncio.TimeoutError:
+        logger.warning("TMDB API request timed out")
+        return None
+    except Exception as e:
+        logger.error(f"TMDB API request failed: {e}")
+        return None
+    
+    # Rate limited: back off outside the limiter, then retry once
+    if retry_on_429 and retry_after is not None and retry_after <= MAX_RETRY_AFTER_SEC:
+        await asyncio.sleep(retry_after)
+        return await _rate_limited_request(url, params, retry_on_429=False)
+    return None
+
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    """Parse a Retry-After header (seconds), defaulting to 1 second."""
+    try:
+        return max(0.0, float(value)) if value else 1.0
+    except ValueError:
+        return 1.0
 
 
 async def _search_movie_tmdb(title: str, year: Optional[int] = None, language: str = "hu-HU") -> Optional[int]:
@@ -116,7 +163,7 @@ async def _search_movie_tmdb(title: str, year: Optional[int] = None, language: s
     if not data or not data.get("results"):
         # Try again with English if Hungarian didn't work
         if language == "hu-HU":
-            logger.debug(f"No results for '{title}' in Hungarian, trying English")
+            logger.debug("No results for '%s' in Hungarian, trying English", title)
             return await _search_movie_tmdb(title, year, "en-US")
         return None
     
@@ -124,44 +171,37 @@ async def _search_movie_tmdb(title: str, year: Optional[int] = None, language: s
     return data["results"][0].get("id")
 
 
-async def _get_imdb_id_from_tmdb(tmdb_id: int) -> Optional[str]:
-    """Get IMDb ID from TMDB movie ID.
+async def _get_movie_bundle(tmdb_id: int) -> Optional[Dict[str, Any]]:
+    """Get movie details and external IDs from TMDB in a single request.
+    
+    Uses append_to_response so the IMDb ID and poster come back in one
+    round-trip instead of separate details/external_ids calls.
     
     Args:
         tmdb_id: TMDB movie ID
         
     Returns:
-        IMDb ID (e.g., "tt0133093") or None
+        Dict with movie details (poster_path, imdb_id, external_ids), or None
     """
-    url = f"{TMDB_BASE_URL}/movie/{tmdb_id}/external_ids"
-    params = {"api_key": TMDB_API_KEY}
-    
-    data = await _rate_limited_request(url, params)
-    
-    if not data:
-        return None
-    
-    imdb_id = data.get("imdb_id")
-    if imdb_id and imdb_id.startswith("tt"):
-        return imdb_id
+    url = f"{TMDB_BASE_URL}/movie/{tmdb_id}"
+    params = {"api_key": TMDB_API_KEY, "append_to_response": "external_ids"}
     
-    return None
+    return await _rate_limited_request(url, params)
 
 
-async def _get_movie_details_from_tmdb(tmdb_id: int) -> Optional[Dict[str, Any]]:
-    """Get full movie details from TMDB including poster.
+def _extract_imdb_id(details: Dict[str, Any]) -> Optional[str]:
+    """Pull a valid IMDb ID out of a TMDB movie bundle.
     
     Args:
-        tmdb_id: TMDB movie ID
+        details: Response from _get_movie_bundle
         
     Returns:
-        Dict with movie details including poster_path, or None
+        IMDb ID (e.g., "tt0133093") or None
     """
-    url = f"{TMDB_BASE_URL}/movie/{tmdb_id}"
-    params = {"api_key": TMDB_API_KEY}
-    
-    data = await _rate_limited_request(url, params)
-    return data
+    imdb_id = details.get("imdb_id") or (details.get("external_ids") or {}).get("imdb_id")
+    if imdb_id and imdb_id.startswith("tt"):
+        return imdb_id
+    return None
 
 
 async def lookup_imdb_id(
@@ -173,7 +213,9 @@ async def lookup_imdb_id(
     
     This is the main entry point for IMDb lookups. It queries TMDB API
     and returns the IMDb ID if found. Results are cached automatically
-    by the imdb_cache module.
+    by the imdb_cache module. Shares lookup_imdb_data's path: the TMDB
+    bundle carries the ID and poster together, so asking for the ID only
+    costs no fewer requests, and the cached poster serves later callers.
     
     Args:
         title: Movie title (can be Hungarian or English)
@@ -189,9 +231,7 @@ async def lookup_imdb_id(
         "tt0133093"
     """
     result = await lookup_imdb_data(title, year, language)
-    if result and isinstance(result, dict):
-        return result.get("imdb_id")
-    return None
+    return result["imdb_id"] if result else None
 
 
 async def lookup_imdb_data(
@@ -230,44 +270,61 @@ async def lookup_imdb_data(
     # Normalize title for better matching
     normalized_title = title.strip()
     
-    # Check cache first (only for IMDb ID, not full data yet)
+    # Check cache first (ID and poster; None means a cached failed lookup)
     try:
-        cached_result = get_cached_imdb_id(normalized_title, year)
-        if cached_result:
-            # We have cached IMDb ID, but need to get poster separately
-            # For now, just return the ID - poster caching could be added later
-            return {"imdb_id": cached_result, "poster_url": None}
-        elif cached_result is None:
-            # Cached failed lookup
-            return None
+        return get_cached_imdb_data(normalized_title, year)
     except KeyError:
         # Not in cache, proceed with API lookup
         pass
     
-    logger.debug(f"Looking up IMDb data for '{normalized_title}' (year: {year})")
+    key = _cache_key(normalized_title, year)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_imdb_data(normalized_title, year, language))
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the lookup for the others
+    return await asyncio.shield(task)
+
+
+async def _fetch_imdb_data(
+    normalized_title: str,
+    year: Optional[int],
+    language: str
+) -> Optional[Dict[str, Any]]:
+    """Query TMDB for IMDb ID and poster, caching the outcome.
+    
+    Args:
+        normalized_title: Stripped movie title
+        year: Release year (optional)
+        language: TMDB language code
+        
+    Returns:
+        Dict with {"imdb_id": str, "poster_url": str} or None if not found
+    """
+    logger.debug("Looking up IMDb data for '%s' (year: %s)", normalized_title, year)
     
     try:
         # Step 1: Search for movie on TMDB
         tmdb_id = await _search_movie_tmdb(normalized_title, year, language)
         
         if not tmdb_id:
-            logger.debug(f"No TMDB results for '{normalized_title}'")
+            logger.debug("No TMDB results for '%s'", normalized_title)
             # Cache the failed lookup to avoid repeated API calls
-            set_cached_imdb_id(normalized_title, year, None)
+            set_cached_imdb_data(normalized_title, year, None)
             return None
         
-        # Step 2: Get full movie details (includes external IDs and poster)
-        details = await _get_movie_details_from_tmdb(tmdb_id)
+        # Step 2: Get movie details with external IDs appended (one request)
+        details = await _get_movie_bundle(tmdb_id)
         
         if not details:
-            logger.debug(f"No details found for TMDB movie {tmdb_id}")
-            set_cached_imdb_id(normalized_title, year, None)
+            logger.debug("No details found for TMDB movie %s", tmdb_id)
+            set_cached_imdb_data(normalized_title, year, None)
             return None
         
-        # Step 3: Get IMDb ID from external IDs endpoint
-        imdb_id = await _get_imdb_id_from_tmdb(tmdb_id)
+        imdb_id = _extract_imdb_id(details)
         
-        # Step 4: Build poster URL if available
+        # Step 3: Build poster URL if available
         poster_url = None
         if details.get("poster_path"):
             # TMDB poster URLs: https://image.tmdb.org/t/p/{size}{poster_path}
@@ -277,18 +334,19 @@ async def lookup_imdb_data(
         if imdb_id:
             logger.info(f"Found IMDb ID {imdb_id} for '{normalized_title}' with poster: {bool(poster_url)}")
         else:
-            logger.debug(f"No IMDb ID found for TMDB movie {tmdb_id}")
-        
-        # Cache the IMDb ID result (even if None)
-        set_cached_imdb_id(normalized_title, year, imdb_id)
+            logger.debug("No IMDb ID found for TMDB movie %s", tmdb_id)
         
         if not imdb_id:
+            # Cache the failed lookup too
+            set_cached_imdb_data(normalized_title, year, None)
             return None
         
-        return {
+        result = {
             "imdb_id": imdb_id,
             "poster_url": poster_url
         }
+        set_cached_imdb_data(normalized_title, year, result)
+        return result
         
     except Exception as e:
         logger.error(f"Unexpected error during IMDb lookup for '{normalized_title}': {e}")
@@ -300,8 +358,10 @@ async def batch_lookup_imdb_ids(
 ) -> Dict[str, Optional[str]]:
     """Batch lookup multiple movies (for optimization).
     
-    This function performs concurrent lookups for multiple movies,
-    respecting rate limits and caching.
+    All lookups are started at once; the shared rate limiter and connection
+    pool schedule the actual TMDB requests. Duplicate titles (same
+    normalized title and year, e.g. one film on several channels) are
+    looked up once.
     
     Args:
         movies: List of (title, year) tuples
@@ -318,22 +378,30 @@ async def batch_lookup_imdb_ids(
     if not IMDB_LOOKUP_ENABLED or not TMDB_API_KEY:
         return {title: None for title, _ in movies}
     
-    logger.info(f"Batch lookup for {len(movies)} movies")
+    # Deduplicate by cache identity, keeping the first spelling of each title
+    unique: Dict[Tuple[str, Optional[int]], Tuple[str, Optional[int]]] = {}
+    for title, year in movies:
+        unique.setdefault(_cache_key(title, year), (title, year))
     
-    # Create lookup tasks
-    tasks = [lookup_imdb_id(title, year) for title, year in movies]
+    logger.info(f"Batch lookup for {len(movies)} movies ({len(unique)} unique)")
     
-    # Execute concurrently (respecting rate limits via semaphore)
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    results = await asyncio.gather(
+        *[lookup_imdb_id(title, year) for title, year in unique.values()],
+        return_exceptions=True
+    )
     
-    # Map results back to titles
-    result_dict = {}
-    for (title, _), result in zip(movies, results):
+    unique_results = {}
+    for key, (title, _), result in zip(unique.keys(), unique.values(), results):
         if isinstance(result, Exception):
             logger.error(f"Batch lookup failed for '{title}': {result}")
-            result_dict[title] = None
-        else:
-            result_dict[title] = result
+            result = None
+        unique_results[key] = result
+    
+    # Fan results back out to every original title
+    result_dict = {
+        title: unique_results[_cache_key(title, year)]
+        for title, year in movies
+    }
     
     successful = sum(1 for v in result_dict.values() if v is not None)
     logger.info(f"Batch lookup complete: {successful}/{len(movies)} successful")
@@ -1,14 +1,17 @@
 """Main FastAPI application for Stremio HU Live Movies addon."""
 import os
+import time
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Query
 from urllib.parse import unquote
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from manifest import MANIFEST
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
+from manifest import MANIFEST_BYTES
 from catalog_handler import catalog_handler
 from meta_handler import meta_handler
+from scraper import cleanup_scraper, get_scraper_status
+from imdb_lookup import close_session, get_api_status
 from rich.console import Console
 from rich.logging import RichHandler
 from rich.traceback import install as install_rich_traceback
@@ -17,29 +20,43 @@ from rich.traceback import install as install_rich_traceback
 # Configuration
 PORT = int(os.getenv("PORT", "7000"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "info").upper()
+RELOAD = os.getenv("RELOAD", "false").lower() == "true"  # Auto-reload for local development only
 
-# Setup Rich console and traceback
+# Setup Rich console (also used for the startup banner)
 console = Console()
-install_rich_traceback(show_locals=True, suppress=[])
-
-# Setup Rich logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[
-        RichHandler(
-            console=console,
-            rich_tracebacks=True,
-            tracebacks_show_locals=True,
-            markup=True,
-            show_time=True,
-            show_path=True,
-        )
-    ]
-)
+
+# Rich formatting is only worth its per-record cost when debugging;
+# otherwise use a plain stream handler
+if LOG_LEVEL == "DEBUG":
+    install_rich_traceback(show_locals=False, suppress=[])
+    log_handler: logging.Handler = RichHandler(
+        console=console,
+        rich_tracebacks=True,
+        tracebacks_show_locals=False,
+        markup=True,
+        show_time=True,
+        show_path=False,
+    )
+    log_handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+else:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s",
+        datefmt="%H:%M:%S",
+    ))
+
+logging.basicConfig(level=getattr(logging, LOG_LEVEL), handlers=[log_handler])
 logger = logging.getLogger(__name__)
 
+# Minimal 1x1 transparent ICO file served for /favicon.ico
+_FAVICON = (
+    b'\x00\x00\x01\x00\x01\x00\x01\x01\x00\x00\x01\x00\x18\x00'
+    b'(\x00\x00\x00\x16\x00\x00\x00(\x00\x00\x00\x01\x00\x00\x00'
+    b'\x02\x00\x00\x00\x01\x00\x18\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\xff\xff\xff\x00\x00\x00\x00\x00'
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -49,13 +66,17 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down addon, cleaning up resources...")
-    from scraper import cleanup_scraper
     await cleanup_scraper()
+    await close_session()
     logger.info("Cleanup complete")
 
 
-# Create FastAPI app with lifecycle management
-app = FastAPI(title="Stremio HU Live Movies", lifespan=lifespan)
+# Create FastAPI app with lifecycle management (orjson for all JSON responses)
+app = FastAPI(
+    title="Stremio HU Live Movies",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Add CORS middleware to allow requests from Stremio clients
 app.add_middleware(
@@ -70,17 +91,12 @@ app.add_middleware(
 @app.get("/")
 async def root():
     """Root endpoint - redirect to manifest."""
-    from fastapi.responses import RedirectResponse
     return RedirectResponse(url="/manifest.json")
 
 
 @app.get("/healthz")
 async def health_check():
     """Health check endpoint with scraper and IMDb lookup status."""
-    import time
-    from scraper import get_scraper_status
-    from imdb_lookup import get_api_status
-    
     scraper_status = await get_scraper_status()
     imdb_status = get_api_status()
     
@@ -94,8 +110,8 @@ async def health_check():
 
 @app.get("/manifest.json")
 async def get_manifest():
-    """Return Stremio addon manifest."""
-    return JSONResponse(content=MANIFEST)
+    """Return Stremio addon manifest (pre-serialized at import)."""
+    return Response(content=MANIFEST_BYTES, media_type="application/json")
 
 
 @app.get("/catalog/{type}/{id}.json")
@@ -114,11 +130,11 @@ async def get_catalog(
             extra["time"] = time
         
         result = await catalog_handler(type, id, extra)
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error in catalog handler: {e}", exc_info=True)
         # Return empty catalog instead of 500 error
-        return JSONResponse(
+        return ORJSONResponse(
             content={"metas": []},
             status_code=200  # Return 200 with empty results for better UX
         )
@@ -154,11 +170,11 @@ async def get_catalog_with_extra(
         logger.info(f"Catalog request with path extras: {extra_params}")
         
         result = await catalog_handler(type, id, extra_params)
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error in catalog handler with extras: {e}", exc_info=True)
         # Return empty catalog instead of 500 error
-        return JSONResponse(
+        return ORJSONResponse(
             content={"metas": []},
             status_code=200  # Return 200 with empty results for better UX
         )
@@ -175,17 +191,17 @@ async def get_meta(type: str, id: str):
     raw_id = id
     id = unquote(id)
     if id != raw_id:
-        logger.debug(f"Decoded meta id from '{raw_id}' to '{id}'")
+        logger.debug("Decoded meta id from '%s' to '%s'", raw_id, id)
     
-    logger.info(f"Meta request for {type}/{id}")
+    logger.info("Meta request for %s/%s", type, id)
     
     try:
         result = await meta_handler(type, id)
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error in meta handler: {e}", exc_info=True)
         # Return empty meta instead of 500 error
-        return JSONResponse(
+        return ORJSONResponse(
             content={"meta": None},
             status_code=200  # Return 200 with null meta for better UX
         )
@@ -194,17 +210,7 @@ async def get_meta(type: str, id: str):
 @app.get("/favicon.ico")
 async def get_favicon():
     """Return a simple favicon to prevent 404 errors."""
-    from fastapi.responses import Response
-    # Return a minimal 1x1 transparent ICO file
-    # This is a base64 decoded minimal ICO format
-    ico_data = (
-        b'\x00\x00\x01\x00\x01\x00\x01\x01\x00\x00\x01\x00\x18\x00'
-        b'(\x00\x00\x00\x16\x00\x00\x00(\x00\x00\x00\x01\x00\x00\x00'
-        b'\x02\x00\x00\x00\x01\x00\x18\x00\x00\x00\x00\x00\x00\x00'
-        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
-        b'\x00\x00\x00\x00\xff\xff\xff\x00\x00\x00\x00\x00'
-    )
-    return Response(content=ico_data, media_type="image/x-icon")
+    return Response(content=_FAVICON, media_type="image/x-icon")
 
 
 if __name__ == "__main__":
@@ -224,9 +230,12 @@ if __name__ == "__main__":
     
     logger.info(f"Starting addon on port {PORT}")
     uvicorn.run(
-        "main:app",  # Import string for auto-reload
+        "main:app",  # Import string (required for reload/workers)
         host="0.0.0.0",
         port=PORT,
         log_level=LOG_LEVEL.lower(),
-        reload=True  # Auto-reload on code changes
+        reload=RELOAD,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),  # Each worker has its own cache and browser
     )
@@ -1,4 +1,5 @@
 """Stremio addon manifest configuration."""
+import orjson
 
 MANIFEST = {
     "id": "hu.live.movies",
@@ -19,3 +20,9 @@ MANIFEST = {
         ]
     }]
 }
+
+# Guard against advertising resource types Stremio doesn't know about
+assert set(MANIFEST["resources"]) <= {"catalog", "meta", "stream", "subtitles"}
+
+# The manifest never changes at runtime, so serialize it once at import
+MANIFEST_BYTES = orjson.dumps(MANIFEST)
@@ -1,17 +1,67 @@
 """Meta handler for Stremio addon - provides detailed movie information."""
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
-from scraper import fetch_live_movies
-from utils import is_probably_film, slugify
-from models import StremioMeta
+import re
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from scraper import get_movie_by_key
+from utils import extract_year, is_probably_film
 from imdb_lookup import lookup_imdb_data, is_lookup_enabled
 
 
 logger = logging.getLogger(__name__)
 
+# Meta requests currently being built, keyed by (type, id), so concurrent
+# requests for the same ID share one computation
+_meta_inflight: Dict[Tuple[str, str], "asyncio.Task[Dict[str, Any]]"] = {}
 
-def parse_meta_id(meta_id: str) -> Optional[Dict[str, str]]:
+# musortv:channel-slug:timestamp:title-slug
+_META_ID_RE = re.compile(r"musortv:([^:]*):(\d+):([^:]*)")
+
+
+class ParsedMetaId(NamedTuple):
+    """Components of a musortv meta ID.
+
+    Field order matches the scraper's MovieKey, so an instance can be used
+    directly as a lookup key.
+    """
+    channel_slug: str
+    timestamp: str
+    title_slug: str
+
+
+# Meta description, with and without the genre line
+_DESC_FOOTER = (
+    "\n\n📡 **Élő adás a magyar TV-ből**"
+    "\n\n💡 *Tipp: Használj stream kiegészítőt (pl. Torrentio) a megtekintéshez*"
+)
+_DESC_TMPL = (
+    "📺 **Csatorna:** {channel}\n🕐 **Kezdés:** {date} {time}\n🎬 **Műfaj:** {category}"
+    + _DESC_FOOTER
+)
+_DESC_TMPL_NO_CATEGORY = "📺 **Csatorna:** {channel}\n🕐 **Kezdés:** {date} {time}" + _DESC_FOOTER
+
+# Hungarian genre keywords, checked in order (first match wins)
+_GENRE_MAP = {
+    "akció": "Akció",
+    "vígjáték": "Vígjáték",
+    "dráma": "Dráma",
+    "thriller": "Thriller",
+    "horror": "Horror",
+    "sci-fi": "Sci-Fi",
+    "fantasy": "Fantasy",
+    "kaland": "Kaland",
+    "romantikus": "Romantikus",
+    "bűnügyi": "Bűnügyi",
+    "western": "Western",
+    "háborús": "Háborús",
+    "dokumentum": "Dokumentumfilm",
+    "animáció": "Animáció",
+    "családi": "Családi"
+}
+
+
+def parse_meta_id(meta_id: str) -> Optional[ParsedMetaId]:
     """Parse a musortv meta ID into its components.
     
     Expected format: musortv:channel-slug:timestamp:title-slug
@@ -21,32 +71,15 @@ def parse_meta_id(meta_id: str) -> Optional[Dict[str, str]]:
         meta_id: The meta ID to parse
         
     Returns:
-        Dictionary with keys: channel_slug, timestamp, title_slug
+        ParsedMetaId (channel_slug, timestamp, title_slug)
         or None if parsing fails
     """
-    if not meta_id.startswith("musortv:"):
-        logger.warning(f"Invalid meta ID format (missing prefix): {meta_id}")
-        return None
-    
-    parts = meta_id.split(":")
-    if len(parts) != 4:
-        logger.warning(f"Invalid meta ID format (wrong part count): {meta_id}")
+    m = _META_ID_RE.fullmatch(meta_id)
+    if not m:
+        logger.warning("Invalid meta ID format: %s", meta_id)
         return None
     
-    _, channel_slug, timestamp_str, title_slug = parts
-    
-    try:
-        # Validate timestamp is numeric
-        int(timestamp_str)
-        
-        return {
-            "channel_slug": channel_slug,
-            "timestamp": timestamp_str,
-            "title_slug": title_slug
-        }
-    except ValueError:
-        logger.warning(f"Invalid meta ID format (bad timestamp): {meta_id}")
-        return None
+    return ParsedMetaId(m[1], m[2], m[3])
 
 
 async def meta_handler(type_: str, id_: str) -> Dict[str, Any]:
@@ -63,32 +96,40 @@ async def meta_handler(type_: str, id_: str) -> Dict[str, Any]:
     Returns:
         Dictionary with "meta" key containing detailed movie information
     """
-    logger.info(f"Meta request for {type_}/{id_}")
-    
+    logger.info("Meta request for %s/%s", type_, id_)
+    
+    key = (type_, id_)
+    task = _meta_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_build_meta(type_, id_))
+        _meta_inflight[key] = task
+        task.add_done_callback(lambda _t: _meta_inflight.pop(key, None))
+    else:
+        logger.debug("Joining in-flight meta request for %s", id_)
+    # Shield so one disconnecting client doesn't cancel the build for the others
+    return await asyncio.shield(task)
+
+
+async def _build_meta(type_: str, id_: str) -> Dict[str, Any]:
+    """Build the meta response for meta_handler (see there for ID formats)."""
     # Validate type
     if type_ != "movie":
-        logger.warning(f"Unsupported content type: {type_}")
+        logger.warning("Unsupported content type: %s", type_)
         return {"meta": None}
     
     # Check if this is an IMDb ID or custom musortv ID
     if id_.startswith("tt") and id_[2:].isdigit():
         # IMDb ID format - need to match by title from catalog
-        logger.info(f"IMDb ID detected: {id_}, fetching from catalog for title match")
+        logger.info("IMDb ID detected: %s, fetching from catalog for title match", id_)
         
         # Import here to avoid circular dependency
-        from catalog_handler import catalog_handler
-        
-        # Get catalog to find the movie with this IMDb ID
-        catalog_result = await catalog_handler(type_="movie", id_="hu-live", extra={})
-        matching_meta = None
+        from catalog_handler import find_catalog_meta
         
-        for meta in catalog_result.get("metas", []):
-            if meta.get("id") == id_:
-                matching_meta = meta
-                break
+        # Look the IMDb ID up in the catalog's ID index
+        matching_meta = await find_catalog_meta(id_)
         
         if not matching_meta:
-            logger.warning(f"No movie found in catalog with IMDb ID: {id_}")
+            logger.warning("No movie found in catalog with IMDb ID: %s", id_)
             return {"meta": None}
         
         # Return the catalog meta (which already has all the info)
@@ -100,131 +141,79 @@ async def meta_handler(type_: str, id_: str) -> Dict[str, Any]:
     if not parsed:
         return {"meta": None}
     
-    channel_slug = parsed["channel_slug"]
-    timestamp_str = parsed["timestamp"]
-    title_slug = parsed["title_slug"]
-    
-    # Fetch current live movies to find matching entry
+    # Look up the entry in the current live movies
     try:
-        raw_movies = await fetch_live_movies(force=False)
+        matching_movie = await get_movie_by_key(parsed)
         
-        # Find the movie that matches our ID components
-        matching_movie = None
-        for movie in raw_movies:
-            if not is_probably_film(movie.category):
-                continue
-            
-            # Parse movie timestamp
-            try:
-                movie_start = datetime.fromisoformat(movie.start_iso.replace("Z", "+00:00"))
-                movie_timestamp = int(movie_start.timestamp())
-                
-                # Check if this is the same movie
-                if (slugify(movie.channel) == channel_slug and
-                    str(movie_timestamp) == timestamp_str and
-                    slugify(movie.title) == title_slug):
-                    matching_movie = movie
-                    break
-            except (ValueError, AttributeError):
-                continue
-        
-        if not matching_movie:
-            logger.info(f"No matching movie found for ID: {id_}")
+        if not matching_movie or not is_probably_film(matching_movie.category):
+            logger.info("No matching movie found for ID: %s", id_)
             return {"meta": None}
         
         # Build detailed metadata
-        start_time = datetime.fromisoformat(matching_movie.start_iso.replace("Z", "+00:00"))
-        time_str = start_time.strftime("%H:%M")
-        date_str = start_time.strftime("%Y.%m.%d")
+        time_str = matching_movie.time_str
+        date_str = matching_movie.date_str
         
         # Try to get IMDb poster if enabled
         poster = matching_movie.poster
         if is_lookup_enabled():
-            # Extract year from category if available
-            year = None
-            if matching_movie.category and "," in matching_movie.category:
-                parts = matching_movie.category.split(",")
-                for part in parts:
-                    clean_part = part.strip()
-                    if clean_part.isdigit() and len(clean_part) == 4:
-                        year = int(clean_part)
-                        break
-            
+            year = extract_year(matching_movie.category)
             imdb_data = await lookup_imdb_data(matching_movie.title, year)
             if imdb_data and imdb_data.get("poster_url"):
                 poster = imdb_data["poster_url"]
-                logger.debug(f"Using IMDb poster for '{matching_movie.title}'")
+                logger.debug("Using IMDb poster for '%s'", matching_movie.title)
         
         # Parse genres
-        genres = _parse_genres(matching_movie.category)
+        genres = list(_parse_genres(matching_movie.category)) if matching_movie.category else None
         
         # Enhanced description with all available information
-        description_parts = []
-        description_parts.append(f"📺 **Csatorna:** {matching_movie.channel}")
-        description_parts.append(f"🕐 **Kezdés:** {date_str} {time_str}")
-        if matching_movie.category:
-            description_parts.append(f"🎬 **Műfaj:** {matching_movie.category}")
-        description_parts.append("\n📡 **Élő adás a magyar TV-ből**")
-        description_parts.append("\n💡 *Tipp: Használj stream kiegészítőt (pl. Torrentio) a megtekintéshez*")
-        
-        description = "\n".join(description_parts)
-        
-        # Create rich metadata
-        meta = StremioMeta(
-            id=id_,
-            type="movie",
-            name=matching_movie.title,
-            poster=poster,
-            background=poster,
-            genres=genres,
-            description=description,
-            releaseInfo=f"📅 {date_str} • {time_str}",
-            runtime=None,  # Unknown for live TV
-            director=None,
-            cast=None,
-            links=[],
-            behaviorHints={
-                "defaultVideoId": None
-            }
-        )
+        template = _DESC_TMPL if matching_movie.category else _DESC_TMPL_NO_CATEGORY
+        description = template.format_map({
+            "channel": matching_movie.channel,
+            "date": date_str,
+            "time": time_str,
+            "category": matching_movie.category,
+        })
+        
+        # Create rich metadata (StremioMeta field order; runtime, director
+        # and cast are unknown for live TV). Built as a plain dict: the values
+        # are produced here, so model validation + model_dump would only add cost.
+        meta = {
+            k: v for k, v in (
+                ("id", id_),
+                ("type", "movie"),
+                ("name", matching_movie.title),
+                ("poster", poster),
+                ("background", poster),
+                ("description", description),
+                ("releaseInfo", f"📅 {date_str} • {time_str}"),
+                ("genres", genres),
+                ("links", []),
+                ("behaviorHints", {"defaultVideoId": None}),
+            )
+            if v is not None
+        }
         
-        logger.info(f"Returning metadata for: {matching_movie.title}")
-        return {"meta": meta.model_dump(exclude_none=True)}
+        logger.info("Returning metadata for: %s", matching_movie.title)
+        return {"meta": meta}
         
     except Exception as e:
         logger.error(f"Error fetching metadata: {e}", exc_info=True)
         return {"meta": None}
 
 
-def _parse_genres(category: Optional[str]) -> Optional[list[str]]:
-    """Parse and map Hungarian genre names."""
-    if not category:
-        return None
+@lru_cache(maxsize=512)
+def _parse_genres(category: str) -> Tuple[str, ...]:
+    """Parse and map Hungarian genre names.
     
+    Memoized: the same category string repeats across channels and refreshes.
+    Returns a tuple so the cached value can't be mutated by callers.
+    """
     base = category.split(",")[0] if "," in category else category
     lc = base.lower()
     
-    genre_map = {
-        "akció": "Akció",
-        "vígjáték": "Vígjáték",
-        "dráma": "Dráma",
-        "thriller": "Thriller",
-        "horror": "Horror",
-        "sci-fi": "Sci-Fi",
-        "fantasy": "Fantasy",
-        "kaland": "Kaland",
-        "romantikus": "Romantikus",
-        "bűnügyi": "Bűnügyi",
-        "western": "Western",
-        "háborús": "Háborús",
-        "dokumentum": "Dokumentumfilm",
-        "animáció": "Animáció",
-        "családi": "Családi"
-    }
-    
-    for key, value in genre_map.items():
+    for key, value in _GENRE_MAP.items():
         if key in lc:
-            return [value]
+            return (value,)
     
     # Default: return cleaned category
-    return [base.strip().title()]
+    return (base.strip().title(),)
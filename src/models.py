@@ -1,6 +1,17 @@
 """Type definitions for Stremio HU Live Movies addon."""
+from datetime import datetime
+from functools import cached_property
 from typing import Literal, TypedDict, Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from utils import slugify
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso  # C parser, handles "Z"
+except ImportError:
+    def _parse_iso(s: str) -> datetime:
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        return datetime.fromisoformat(s)
 
 
 TimePreset = Literal["now", "next2h", "tonight"]
@@ -13,13 +24,52 @@ class CatalogExtra(TypedDict, total=False):
 
 
 class LiveMovieRaw(BaseModel):
-    """Raw movie data from scraper."""
+    """Raw movie data from scraper.
+    
+    Immutable: rows are shared between the scraper's cached result, its
+    meta index and catalog builds. The scraper builds them with
+    model_construct since it already produces clean strings.
+    """
+    model_config = ConfigDict(frozen=True)
+    
     title: str
     start_iso: str  # ISO format datetime string
     channel: str
     category: Optional[str] = None
     poster: Optional[str] = None
     # Note: stream_url removed - catalog addons don't provide streams
+    
+    @cached_property
+    def start_dt(self) -> datetime:
+        """Start time parsed from start_iso (parsed once per row)."""
+        return _parse_iso(self.start_iso)
+    
+    @cached_property
+    def start_ts(self) -> int:
+        """Start time as Unix timestamp, as used in musortv meta IDs."""
+        return int(self.start_dt.timestamp())
+    
+    @cached_property
+    def time_str(self) -> str:
+        """Start time as HH:MM, as shown in catalog and meta responses."""
+        dt = self.start_dt
+        return f"{dt.hour:02d}:{dt.minute:02d}"
+    
+    @cached_property
+    def date_str(self) -> str:
+        """Start date as YYYY.MM.DD, as shown in meta responses."""
+        dt = self.start_dt
+        return f"{dt.year:04d}.{dt.month:02d}.{dt.day:02d}"
+    
+    @cached_property
+    def channel_slug(self) -> str:
+        """Slugified channel name, as used in musortv meta IDs."""
+        return slugify(self.channel)
+    
+    @cached_property
+    def title_slug(self) -> str:
+        """Slugified title, as used in musortv meta IDs."""
+        return slugify(self.title)
 
 
 class StremioMetaPreview(BaseModel):
@@ -2,10 +2,13 @@
 import asyncio
 import os
 import re
+import time
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List, Any, Dict
-from playwright.async_api import async_playwright, Browser, Page
+from typing import Optional, List, Any, Awaitable, Callable, Dict, Tuple, TypeVar
+import httpx
+from selectolax.parser import HTMLParser
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route
 from models import LiveMovieRaw
 
 
@@ -14,28 +17,80 @@ logger = logging.getLogger(__name__)
 # Configuration
 RATE_MS = int(os.getenv("SCRAPE_RATE_MS", "30000"))
 
+# Scraping backend: "http" (httpx + selectolax, default) or "playwright"
+# (headless Chromium, only needed if the listings start requiring JavaScript)
+SCRAPER_BACKEND = os.getenv("SCRAPER_BACKEND", "http").lower()
+
+# Precompiled patterns for field cleanup and musor.tv time parsing
+_WS_RE = re.compile(r"\s+")
+_FULL_DATETIME_RE = re.compile(r"(\d{4})\.(\d{2})\.(\d{2})\s+(\d{1,2}):(\d{2})")  # 2025.10.18 22:30
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")  # 22:30
+
+# Extracts every show event's raw fields in one browser round-trip
+# (Playwright backend); missing elements come back as null
+_SHOW_EVENTS_JS = """
+() => Array.from(document.querySelectorAll('table.showeventtable'), t => {
+    const text = sel => t.querySelector(sel)?.textContent ?? null;
+    const attr = (sel, name) => {
+        const el = t.querySelector(sel);
+        return el ? (el.getAttribute(name) ?? '') : null;
+    };
+    return {
+        title: text('.showeventtitle a'),
+        time: text('.showeventtime'),
+        channel: attr('.showeventchannel img', 'alt'),
+        category: text('td[itemprop="description"]'),
+        img: attr('img.showeventimg', 'src'),
+    };
+})
+"""
+
+# Resource types the Playwright backend never needs (posters are read from
+# the img src attribute, not downloaded)
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Page load retries, with exponential backoff starting at RETRY_DELAY_SEC
+MAX_RETRIES = 3
+RETRY_DELAY_SEC = 2
+
 # Target pages – adjust as needed if markup changes
 PAGES = [
     "https://musor.tv/most/tvben",
     "https://musor.tv/filmek"
 ]
 
+# (channel slug, start timestamp, title slug) - the parts of a musortv meta ID
+MovieKey = Tuple[str, str, str]
+
+T = TypeVar("T")
+
 
 class MusorTvScraper:
     """Thread-safe scraper for musor.tv with proper state management."""
     
-    def __init__(self, rate_limit_ms: int = RATE_MS):
+    def __init__(self, rate_limit_ms: int = RATE_MS, backend: str = SCRAPER_BACKEND):
         """Initialize scraper with rate limiting.
         
         Args:
             rate_limit_ms: Minimum milliseconds between fetches
+            backend: "http" (plain GET + HTML parser) or "playwright" (browser)
         """
-        self._rate_limit_ms = rate_limit_ms
+        self._rate_limit_s = rate_limit_ms / 1000
+        self._backend = backend
+        self._client: Optional[httpx.AsyncClient] = None
+        # Per-URL ETag/Last-Modified and the rows parsed from that version (HTTP backend)
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self._last_parsed: Dict[str, List[LiveMovieRaw]] = {}
         self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None  # Reused across scrapes (keeps cookie consent)
         self._playwright: Optional[Any] = None  # Playwright instance
-        self._last_fetch_at: float = 0
+        # time.monotonic() seconds; -inf so the first fetch is never rate limited
+        self._last_fetch_at: float = float("-inf")  # Last successful fetch
+        self._last_attempt_at: float = float("-inf")  # Last fetch attempt, paces background refreshes
         self._fetch_lock = asyncio.Lock()
         self._in_flight_task: Optional[asyncio.Task] = None
+        self._cached_result: Optional[List[LiveMovieRaw]] = None  # Last successful scrape
+        self._index: Dict[MovieKey, LiveMovieRaw] = {}  # Rebuilt on every fetch
         
         # Status tracking for health monitoring
         self._last_success_at: Optional[float] = None
@@ -45,6 +100,18 @@ class MusorTvScraper:
         self._consecutive_error_count: int = 0
         
     async def initialize(self) -> None:
+        """Initialize the HTTP client or browser instance for the configured backend."""
+        if self._backend == "playwright":
+            await self._initialize_browser()
+        elif self._client is None:
+            logger.info("Initializing HTTP client...")
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": self._get_user_agent()},
+                timeout=30,
+                follow_redirects=True,
+            )
+    
+    async def _initialize_browser(self) -> None:
         """Initialize the browser instance."""
         if self._browser is None:
             logger.info("Initializing Playwright browser...")
@@ -80,10 +147,30 @@ class MusorTvScraper:
                 headless=True,
                 timeout=60000  # Increased timeout for slow environments
             )
+            self._context = await self._browser.new_context(
+                user_agent=self._get_user_agent(),
+                viewport={"width": 1280, "height": 800},
+            )
+            await self._context.route("**/*", self._block_heavy_resources)
             logger.info("Browser initialized successfully")
     
     async def cleanup(self) -> None:
-        """Cleanup browser resources."""
+        """Cleanup HTTP client and browser resources."""
+        # Stop any refresh first so it can't reopen a client after we close it
+        task, self._in_flight_task = self._in_flight_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            # Wait for it to unwind; its own failure was already logged
+            await asyncio.gather(task, return_exceptions=True)
+        
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        
+        if self._context:
+            await self._context.close()
+            self._context = None
+        
         if self._browser:
             logger.info("Closing browser...")
             await self._browser.close()
@@ -96,14 +183,27 @@ class MusorTvScraper:
     async def fetch_live_movies(self, force: bool = False) -> List[LiveMovieRaw]:
         """Fetch live movie data from musor.tv with rate limiting and deduplication.
         
+        Stale-while-revalidate: once a listing has been scraped it is returned
+        immediately, and when it is older than the rate limit a refresh is
+        started in the background. Only a cold start (or force) waits for a
+        scrape.
+        
         Args:
             force: If True, bypass rate limiting and force a fresh fetch
             
         Returns:
             List of LiveMovieRaw objects
         """
+        if not force and self._cached_result is not None:
+            refreshing = self._in_flight_task is not None and not self._in_flight_task.done()
+            if not refreshing and time.monotonic() - self._last_attempt_at >= self._rate_limit_s:
+                logger.debug("Listing is stale, refreshing in background")
+                self._in_flight_task = asyncio.create_task(self._fetch_and_store())
+                self._in_flight_task.add_done_callback(_consume_task_exception)
+            return self._cached_result
+        
         async with self._fetch_lock:
-            now = asyncio.get_event_loop().time() * 1000
+            now = time.monotonic()
             
             # If there's an in-flight request and we're not forcing, reuse it
             if not force and self._in_flight_task and not self._in_flight_task.done():
@@ -111,36 +211,47 @@ class MusorTvScraper:
                 return await self._in_flight_task
             
             # Check rate limit
-            if not force and (now - self._last_fetch_at < self._rate_limit_ms):
+            if not force and (now - self._last_fetch_at < self._rate_limit_s):
                 elapsed = now - self._last_fetch_at
-                remaining = self._rate_limit_ms - elapsed
-                logger.debug(f"Rate limit active, {remaining}ms remaining")
+                remaining = self._rate_limit_s - elapsed
+                logger.debug(f"Rate limit active, {remaining:.1f}s remaining")
                 # If we have a recent completed task, return its result
                 if self._in_flight_task and self._in_flight_task.done():
                     return self._in_flight_task.result()
                 # Otherwise we need to fetch but respect the rate limit
-                await asyncio.sleep(remaining / 1000)
+                await asyncio.sleep(remaining)
             
             # Create and execute fetch task
-            self._in_flight_task = asyncio.create_task(self._fetch())
-            try:
-                result = await self._in_flight_task
-                self._last_fetch_at = asyncio.get_event_loop().time() * 1000
-                
-                # Update success status
-                self._last_success_at = asyncio.get_event_loop().time()
-                self._consecutive_error_count = 0
-                
-                return result
-            except Exception as e:
-                # Update error status
-                self._last_error_at = asyncio.get_event_loop().time()
-                self._last_error = str(e)
-                self._total_error_count += 1
-                self._consecutive_error_count += 1
-                
-                logger.error(f"Fetch failed: {e}", exc_info=True)
-                raise
+            self._in_flight_task = asyncio.create_task(self._fetch_and_store())
+            return await self._in_flight_task
+    
+    async def _fetch_and_store(self) -> List[LiveMovieRaw]:
+        """Run a scrape, publish its result and update health status.
+        
+        Returns:
+            List of deduplicated LiveMovieRaw objects
+        """
+        self._last_attempt_at = time.monotonic()
+        try:
+            result = await self._fetch()
+        except Exception as e:
+            # Update error status
+            self._last_error_at = time.monotonic()
+            self._last_error = str(e)
+            self._total_error_count += 1
+            self._consecutive_error_count += 1
+            
+            logger.error(f"Fetch failed: {e}", exc_info=True)
+            raise
+        
+        self._cached_result = result
+        self._last_fetch_at = time.monotonic()
+        
+        # Update success status
+        self._last_success_at = self._last_fetch_at
+        self._consecutive_error_count = 0
+        
+        return result
     
     async def _fetch(self) -> List[LiveMovieRaw]:
         """Internal method to perform the actual scraping.
@@ -148,119 +259,210 @@ class MusorTvScraper:
         Returns:
             List of deduplicated LiveMovieRaw objects
         """
-        logger.info("Starting fetch_live_movies...")
+        logger.info(f"Starting fetch_live_movies ({self._backend} backend)...")
         
-        # Ensure browser is initialized
+        # Ensure HTTP client/browser is initialized
         await self.initialize()
         
-        if not self._browser:
-            raise RuntimeError("Browser not initialized")
+        if self._backend == "playwright":
+            scrape_page = self._scrape_page_browser
+        else:
+            scrape_page = self._scrape_page_http
+        
+        # Scrape all pages concurrently; results keep PAGES order for dedupe
+        logger.info(f"Scraping {len(PAGES)} pages: {', '.join(PAGES)}")
+        pages = await asyncio.gather(*(scrape_page(url) for url in PAGES), return_exceptions=True)
         
         results: List[LiveMovieRaw] = []
+        errors: List[BaseException] = []
+        for url, page_results in zip(PAGES, pages):
+            if isinstance(page_results, BaseException):
+                logger.error(f"Failed to scrape {url}: {page_results}", exc_info=page_results)
+                errors.append(page_results)
+                continue
+            results.extend(page_results)
         
-        for url in PAGES:
-            logger.info(f"Scraping {url}")
-            page = await self._browser.new_page(user_agent=self._get_user_agent())
-            
-            # Set a longer default timeout for slow environments
-            page.set_default_timeout(90000)  # 90 seconds
-            
+        # Nothing scraped at all: fail so the previous listing and index are kept
+        if len(errors) == len(PAGES):
+            raise RuntimeError(f"All {len(PAGES)} pages failed to scrape") from errors[0]
+        
+        logger.info(f"Total raw results before deduplication: {len(results)}")
+        deduplicated = self._dedupe(results)
+        logger.info(f"Total results after deduplication: {len(deduplicated)}")
+        self._index = self._build_index(deduplicated)
+        return deduplicated
+    
+    async def _scrape_page_http(self, url: str) -> List[LiveMovieRaw]:
+        """Scrape one listing page with a plain GET and selectolax.
+        
+        musor.tv renders the schedule tables server-side, so no JavaScript
+        needs to run to see them. Requests are conditional: if the page is
+        unchanged (304) the rows parsed from the previous version are reused.
+        """
+        if not self._client:
+            raise RuntimeError("HTTP client not initialized")
+        
+        async def _get() -> httpx.Response:
+            headers = self._validators.get(url) if url in self._last_parsed else None
+            resp = await self._client.get(url, headers=headers)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+            return resp
+        
+        resp = await self._load_with_retries(url, _get)
+        if resp.status_code == 304:
+            logger.info(f"{url} not modified, reusing {len(self._last_parsed[url])} parsed events")
+            return self._last_parsed[url]
+        
+        tree = HTMLParser(resp.text)
+        cards = tree.css("table.showeventtable")
+        logger.info(f"Found {len(cards)} show events on {url}")
+        
+        results: List[LiveMovieRaw] = []
+        for i, el in enumerate(cards):
             try:
-                # Retry logic for page navigation with exponential backoff
-                max_retries = 3
-                retry_delay = 2  # seconds
-                last_error = None
+                title_elem = el.css_first(".showeventtitle a")
+                time_elem = el.css_first(".showeventtime")
+                channel_elem = el.css_first(".showeventchannel img")
+                if title_elem is None or time_elem is None or channel_elem is None:
+                    continue
                 
-                for attempt in range(max_retries):
-                    try:
-                        logger.info(f"Loading {url} (attempt {attempt + 1}/{max_retries})")
-                        await page.goto(
-                            url, 
-                            wait_until="domcontentloaded",  # Faster than 'load' or 'networkidle'
-                            timeout=90000  # 90 seconds for slow hosts
-                        )
-                        logger.info(f"Successfully loaded {url}")
-                        break  # Success, exit retry loop
-                    except Exception as e:
-                        last_error = e
-                        logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {url}: {e}")
-                        
-                        if attempt < max_retries - 1:  # Don't sleep on last attempt
-                            wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                            logger.info(f"Retrying in {wait_time} seconds...")
-                            await asyncio.sleep(wait_time)
-                        else:
-                            # All retries failed
-                            logger.error(f"All {max_retries} attempts failed for {url}: {last_error}")
-                            raise
+                desc_elem = el.css_first('td[itemprop="description"]')
+                img_elem = el.css_first("img.showeventimg")
                 
-                # Accept cookie if present
-                await self._safe_click(page, 'button:has-text("Elfogadom"), button:has-text("Accept")')
+                movie = self._make_movie(
+                    title=title_elem.text(),
+                    time_text=time_elem.text(),
+                    channel=channel_elem.attributes.get("alt"),
+                    category=desc_elem.text() if desc_elem is not None else None,
+                    img=img_elem.attributes.get("src") if img_elem is not None else None,
+                )
+                if movie:
+                    results.append(movie)
+            except Exception as e:
+                logger.warning(f"Failed to parse show event {i} on {url}: {e}")
+                continue
+        
+        # Remember validators so the next scrape can be a conditional GET
+        validators = {}
+        if resp.headers.get("etag"):
+            validators["If-None-Match"] = resp.headers["etag"]
+        if resp.headers.get("last-modified"):
+            validators["If-Modified-Since"] = resp.headers["last-modified"]
+        if validators:
+            self._validators[url] = validators
+            self._last_parsed[url] = results
+        else:
+            self._validators.pop(url, None)
+            self._last_parsed.pop(url, None)
+        
+        return results
+    
+    async def _scrape_page_browser(self, url: str) -> List[LiveMovieRaw]:
+        """Scrape one listing page in headless Chromium (SCRAPER_BACKEND=playwright)."""
+        if not self._context:
+            raise RuntimeError("Browser not initialized")
+        
+        page = await self._context.new_page()
+        
+        # Set a longer default timeout for slow environments
+        page.set_default_timeout(90000)  # 90 seconds
+        
+        try:
+            await self._load_with_retries(url, lambda: page.goto(
+                url,
+                wait_until="domcontentloaded",  # Faster than 'load' or 'networkidle'
+                timeout=90000  # 90 seconds for slow hosts
+            ))
+            
+            # Accept cookie if present (once per context; consent is kept afterwards)
+            if await self._safe_click(page, 'button:has-text("Elfogadom"), button:has-text("Accept")'):
                 await asyncio.sleep(2)  # Wait for content to load after cookie acceptance
+            
+            # Read all show event tables in a single evaluate call
+            rows = await page.evaluate(_SHOW_EVENTS_JS)
+            logger.info(f"Found {len(rows)} show events on {url}")
+            
+            results: List[LiveMovieRaw] = []
+            for i, row in enumerate(rows):
+                if row["title"] is None or row["time"] is None or row["channel"] is None:
+                    continue
+                try:
+                    movie = self._make_movie(
+                        row["title"], row["time"], row["channel"], row["category"], row["img"]
+                    )
+                    if movie:
+                        results.append(movie)
+                except Exception as e:
+                    logger.warning(f"Failed to parse show event {i} on {url}: {e}")
+                    continue
+            
+            return results
+        finally:
+            await page.close()
+    
+    @staticmethod
+    async def _load_with_retries(url: str, load: Callable[[], Awaitable[T]]) -> T:
+        """Run a page load with retries and exponential backoff.
+        
+        Args:
+            url: URL being loaded (for logging)
+            load: Zero-argument coroutine function performing the load
+            
+        Returns:
+            Result of the first successful load
+        """
+        for attempt in range(MAX_RETRIES):
+            try:
+                logger.info(f"Loading {url} (attempt {attempt + 1}/{MAX_RETRIES})")
+                result = await load()
+                logger.info(f"Successfully loaded {url}")
+                return result
+            except Exception as e:
+                logger.warning(f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {url}: {e}")
                 
-                # Find show event tables - these contain the TV program information
-                cards = page.locator("table.showeventtable")
-                count = await cards.count()
-                logger.info(f"Found {count} show events on {url}")
+                if attempt == MAX_RETRIES - 1:
+                    # All retries failed
+                    logger.error(f"All {MAX_RETRIES} attempts failed for {url}: {e}")
+                    raise
                 
-                for i in range(count):
-                    el = cards.nth(i)
-                    
-                    try:
-                        # Title is in .showeventtitle a
-                        title_elem = el.locator(".showeventtitle a").first
-                        title = await title_elem.text_content()
-                        title = self._cleanup(title)
-                        if not title:
-                            continue
-                        
-                        # Time is in .showeventtime with format "2025.10.18 22:30"
-                        time_elem = el.locator(".showeventtime").first
-                        time_text = await time_elem.text_content()
-                        time_text = self._cleanup(time_text)
-                        
-                        # Channel is in the img alt text or the link
-                        channel_elem = el.locator(".showeventchannel img").first
-                        channel = await channel_elem.get_attribute("alt")
-                        channel = self._cleanup(channel) if channel else ""
-                        
-                        # Category/description is in the td with itemprop="description"
-                        desc_elem = el.locator('td[itemprop="description"]').first
-                        category = await desc_elem.text_content() if await desc_elem.count() > 0 else ""
-                        category = self._cleanup(category)
-                        
-                        # Image is in .showeventimg
-                        img_elem = el.locator("img.showeventimg").first
-                        img = await img_elem.get_attribute("src") if await img_elem.count() > 0 else None
-                        
-                        start_iso = self._infer_start_iso(time_text)
-                        results.append(LiveMovieRaw(
-                            title=title,
-                            start_iso=start_iso,
-                            channel=channel,
-                            category=category,
-                            poster=self._absolutize(img)
-                        ))
-                    except Exception as e:
-                        logger.warning(f"Failed to parse show event {i} on {url}: {e}")
-                        continue
-                    
-            except Exception as e:
-                logger.error(f"Failed to scrape {url}: {e}", exc_info=True)
-            finally:
-                await page.close()
+                wait_time = RETRY_DELAY_SEC * (2 ** attempt)  # Exponential backoff
+                logger.info(f"Retrying in {wait_time} seconds...")
+                await asyncio.sleep(wait_time)
+    
+    @classmethod
+    def _make_movie(
+        cls,
+        title: Optional[str],
+        time_text: Optional[str],
+        channel: Optional[str],
+        category: Optional[str],
+        img: Optional[str],
+    ) -> Optional[LiveMovieRaw]:
+        """Build a LiveMovieRaw from raw field text (shared by both backends).
         
-        logger.info(f"Total raw results before deduplication: {len(results)}")
-        deduplicated = self._dedupe(results)
-        logger.info(f"Total results after deduplication: {len(deduplicated)}")
-        return deduplicated
+        Returns:
+            LiveMovieRaw, or None if the entry has no title
+        """
+        title = cls._cleanup(title)
+        if not title:
+            return None
+        
+        # Trusted, already-cleaned values: skip pydantic validation
+        return LiveMovieRaw.model_construct(
+            title=title,
+            start_iso=cls._infer_start_iso(cls._cleanup(time_text)),
+            channel=cls._cleanup(channel),
+            category=cls._cleanup(category),
+            poster=cls._absolutize(img)
+        )
     
     @staticmethod
     def _cleanup(s: Optional[str]) -> str:
         """Clean up whitespace in string."""
         if not s:
             return ""
-        return re.sub(r"\s+", " ", s).strip()
+        return _WS_RE.sub(" ", s).strip()
     
     @staticmethod
     def _infer_start_iso(time_text: str) -> str:
@@ -274,14 +476,14 @@ class MusorTvScraper:
         we assume it refers to the next day (handles late-night programs).
         """
         # Try full datetime format first: YYYY.MM.DD HH:MM
-        match = re.search(r"(\d{4})\.(\d{2})\.(\d{2})\s+(\d{1,2}):(\d{2})", time_text)
+        match = _FULL_DATETIME_RE.search(time_text)
         if match:
             year, month, day, hour, minute = match.groups()
             d = datetime(int(year), int(month), int(day), int(hour), int(minute))
             return d.isoformat()
         
         # Fallback: HH:MM only - detect day boundary
-        match = re.search(r"(\d{1,2}):(\d{2})", time_text)
+        match = _TIME_RE.search(time_text)
         now = datetime.now()
         
         if match:
@@ -311,27 +513,59 @@ class MusorTvScraper:
         return f"https://musor.tv{prefix}{src}"
     
     @staticmethod
-    async def _safe_click(page: Page, selector: str) -> None:
-        """Safely click element if it exists."""
+    async def _block_heavy_resources(route: Route) -> None:
+        """Abort requests for images, media, fonts and stylesheets."""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    @staticmethod
+    async def _safe_click(page: Page, selector: str) -> bool:
+        """Safely click element if it exists.
+        
+        Returns:
+            True if the element was clicked
+        """
         try:
             el = page.locator(selector).first
             if await el.count():
                 await el.click(timeout=2000)
+                return True
         except Exception as e:
             logger.debug(f"Could not click element '{selector}': {e}")
-            pass
+        return False
     
     @staticmethod
     def _dedupe(items: List[LiveMovieRaw]) -> List[LiveMovieRaw]:
-        """Remove duplicate entries."""
-        seen = set()
-        result = []
+        """Remove duplicate entries (first occurrence wins, order preserved)."""
+        seen: Dict[Tuple[str, str, str], LiveMovieRaw] = {}
         for x in items:
-            key = f"{x.title}|{x.channel}|{x.start_iso[:16]}"
-            if key not in seen:
-                seen.add(key)
-                result.append(x)
-        return result
+            seen.setdefault((x.title, x.channel, x.start_iso[:16]), x)
+        return list(seen.values())
+    
+    @staticmethod
+    def _build_index(items: List[LiveMovieRaw]) -> Dict[MovieKey, LiveMovieRaw]:
+        """Index movies by meta ID components for O(1) meta lookups."""
+        index: Dict[MovieKey, LiveMovieRaw] = {}
+        for x in items:
+            try:
+                key = (x.channel_slug, str(x.start_ts), x.title_slug)
+            except ValueError:
+                continue  # Unparseable start time, can't be addressed by ID
+            index.setdefault(key, x)
+        return index
+    
+    def get_by_key(self, key: MovieKey) -> Optional[LiveMovieRaw]:
+        """Look up a movie from the latest fetch by its meta ID components.
+        
+        Args:
+            key: (channel_slug, timestamp, title_slug) tuple
+            
+        Returns:
+            Matching LiveMovieRaw or None
+        """
+        return self._index.get(key)
     
     @staticmethod
     def _get_user_agent() -> str:
@@ -360,6 +594,12 @@ class MusorTvScraper:
         }
 
 
+def _consume_task_exception(task: asyncio.Task) -> None:
+    """Retrieve a background refresh's exception (already logged) so asyncio doesn't warn."""
+    if not task.cancelled():
+        task.exception()
+
+
 # Singleton instance
 _scraper_instance: Optional[MusorTvScraper] = None
 _scraper_lock = asyncio.Lock()
@@ -368,6 +608,9 @@ _scraper_lock = asyncio.Lock()
 async def get_scraper() -> MusorTvScraper:
     """Get or create the singleton scraper instance.
     
+    The HTTP client/browser is not started here; _fetch initializes it
+    lazily when a scrape actually runs.
+    
     Returns:
         MusorTvScraper instance
     """
@@ -376,7 +619,6 @@ async def get_scraper() -> MusorTvScraper:
     async with _scraper_lock:
         if _scraper_instance is None:
             _scraper_instance = MusorTvScraper(rate_limit_ms=RATE_MS)
-            await _scraper_instance.initialize()
         return _scraper_instance
 
 
@@ -405,6 +647,23 @@ async def fetch_live_movies(force: bool = False) -> List[LiveMovieRaw]:
     return await scraper.fetch_live_movies(force)
 
 
+async def get_movie_by_key(key: MovieKey) -> Optional[LiveMovieRaw]:
+    """Find a movie by its meta ID components.
+    
+    Refreshes the listing through fetch_live_movies (respecting the rate
+    limit) and then does a single index lookup.
+    
+    Args:
+        key: (channel_slug, timestamp, title_slug) tuple
+        
+    Returns:
+        Matching LiveMovieRaw or None
+    """
+    scraper = await get_scraper()
+    await scraper.fetch_live_movies(force=False)
+    return scraper.get_by_key(key)
+
+
 async def get_scraper_status() -> Dict[str, Any]:
     """Get the current status of the scraper instance.
     
@@ -1,16 +1,25 @@
 """Time window computation for filtering live content."""
-from datetime import datetime, timedelta
-from typing import Optional, Literal
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import Literal, NamedTuple, Optional, Tuple, Union
 
 
 TimePreset = Literal["now", "next2h", "tonight"]
 
 
-class TimeWindow:
+class TimeWindow(NamedTuple):
     """Represents a time window with start and end."""
-    def __init__(self, start: datetime, end: datetime):
-        self.start = start
-        self.end = end
+    start: datetime
+    end: datetime
+
+
+@lru_cache(maxsize=8)
+def _tonight_bounds(day: date, tz: Optional[tzinfo]) -> Tuple[datetime, datetime]:
+    """18:00 - 23:59:59.999999 on the given day (only changes at midnight)."""
+    return (
+        datetime(day.year, day.month, day.day, 18, 0, tzinfo=tz),
+        datetime(day.year, day.month, day.day, 23, 59, 59, 999999, tzinfo=tz),
+    )
 
 
 def compute_window(preset: Optional[TimePreset] = None, now: Optional[datetime] = None) -> TimeWindow:
@@ -29,14 +38,30 @@ def compute_window(preset: Optional[TimePreset] = None, now: Optional[datetime]
     elif preset == "next2h":
         end = start + timedelta(hours=2)
     elif preset == "tonight":
-        tonight_start = tz_now.replace(hour=18, minute=0, second=0, microsecond=0)
-        tonight_end = tz_now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        return TimeWindow(tonight_start, tonight_end)
+        return TimeWindow(*_tonight_bounds(tz_now.date(), tz_now.tzinfo))
     
     return TimeWindow(start, end)
 
 
-def within_window(start_iso: str, window: TimeWindow) -> bool:
-    """Check if a time is within the given window."""
-    t = datetime.fromisoformat(start_iso.replace("Z", "+00:00"))
+@lru_cache(maxsize=4096)
+def _parse_iso(s: str) -> datetime:
+    """Parse an ISO timestamp (memoized; the same start times are checked
+    against every window)."""
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    return datetime.fromisoformat(s)
+
+
+def within_window(start: Union[str, datetime], window: TimeWindow) -> bool:
+    """Check if a time (ISO string or already-parsed datetime) is within the given window."""
+    t = start if isinstance(start, datetime) else _parse_iso(start)
     return window.start <= t <= window.end
+
+
+def epoch_bounds(window: TimeWindow) -> Tuple[int, int]:
+    """Window start/end as whole Unix timestamps.
+
+    Lets bulk filters compare against LiveMovieRaw.start_ts (already an int)
+    instead of comparing datetimes row by row.
+    """
+    return int(window.start.timestamp()), int(window.end.timestamp())
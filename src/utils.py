@@ -1,32 +1,77 @@
 """Utility functions for text processing."""
 import re
+import string
 import unicodedata
+from functools import lru_cache
 from typing import Optional
 
 
+# Channel names, titles and categories repeat heavily across scrapes and
+# requests, so the text helpers below are memoized.
+
+class _SlugTable(dict):
+    """str.translate table keeping [a-z0-9] and mapping any other character to "-"."""
+    def __missing__(self, codepoint: int) -> str:
+        return "-"
+
+
+_SLUG_TABLE = _SlugTable({ord(c): c for c in string.ascii_lowercase + string.digits})
+
+# Input that slugify would return unchanged (e.g. slugs parsed back out of IDs)
+_SLUG_SHAPED_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+@lru_cache(maxsize=2048)
 def slugify(s: str) -> str:
     """Convert string to URL-friendly slug."""
-    return re.sub(
-        r"(^-|-$)", "",
-        re.sub(r"[^a-z0-9]+", "-", strip_diacritics(s).lower())
-    )
+    if _SLUG_SHAPED_RE.fullmatch(s):
+        return s
+    # ASCII input (most channel names) has nothing to strip
+    dashed = (s if s.isascii() else strip_diacritics(s)).lower().translate(_SLUG_TABLE)
+    # Collapse runs of "-" and trim them at both ends
+    return "-".join(filter(None, dashed.split("-")))
+
+
+# Hungarian accented letters, which cover nearly every non-ASCII character in
+# musor.tv titles; str.translate handles them in one pass without NFD
+_HU_DIACRITICS = str.maketrans(
+    "áéíóöőúüűÁÉÍÓÖŐÚÜŰ",
+    "aeiooouuuAEIOOOUUU",
+)
 
 
+@lru_cache(maxsize=2048)
 def strip_diacritics(s: str) -> str:
     """Remove diacritical marks from Unicode string."""
+    if s.isascii():
+        return s
+    fast = s.translate(_HU_DIACRITICS)
+    if fast.isascii():
+        return fast
+    # Other scripts/accents: full Unicode decomposition
     return "".join(
-        c for c in unicodedata.normalize("NFD", s)
+        c for c in unicodedata.normalize("NFD", fast)
         if unicodedata.category(c) != "Mn"
     )
 
 
+def extract_year(category: Optional[str]) -> Optional[int]:
+    """Extract a 4-digit release year from a category like "akciófilm, 2019"."""
+    if not category or "," not in category:
+        return None
+    for part in category.split(","):
+        clean_part = part.strip()
+        if clean_part.isdigit() and len(clean_part) == 4:
+            return int(clean_part)
+    return None
+
+
+@lru_cache(maxsize=2048)
 def is_probably_film(category: Optional[str]) -> bool:
     """Heuristic to determine if content is a film vs. series."""
     if not category:
         return False
-    c = category.lower()
-    if "film" in c:
-        return True
-    if "sorozat" in c:
-        return False
-    return False
+    # Anything mentioning "film" counts, including "filmsorozat"; a plain
+    # "sorozat" (series) or any other category does not
+    c = category if category.islower() else category.lower()
+    return "film" in c
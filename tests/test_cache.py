@@ -0,0 +1,73 @@
+"""Unit tests for the TTL cache wrapper.
+
+Run with: pytest tests/test_cache.py -v
+"""
+import asyncio
+import os
+import sys
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cache import create_cache
+
+
+class TestGetOrCompute:
+    """Test single-flight get_or_compute behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_computation(self):
+        """Concurrent misses for one key should run the factory once."""
+        cache = create_cache(60_000)
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return ["value"]
+
+        results = await asyncio.gather(*[cache.get_or_compute("k", factory) for _ in range(5)])
+
+        assert calls == 1
+        assert all(r == ["value"] for r in results)
+        assert cache.get("k") == ["value"]
+
+    @pytest.mark.asyncio
+    async def test_cached_value_skips_factory(self):
+        """A cached value should be returned without calling the factory."""
+        cache = create_cache(60_000)
+        cache.set("k", ["cached"])
+
+        async def factory():
+            raise AssertionError("factory should not be called")
+
+        assert await cache.get_or_compute("k", factory) == ["cached"]
+
+    @pytest.mark.asyncio
+    async def test_empty_result_not_cached(self):
+        """Falsy results are returned but not stored."""
+        cache = create_cache(60_000)
+
+        async def factory():
+            return []
+
+        assert await cache.get_or_compute("k", factory) == []
+        assert not cache.has("k")
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_and_clears_inflight(self):
+        """A failing factory raises to callers and allows a retry."""
+        cache = create_cache(60_000)
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def working():
+            return ["ok"]
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("k", failing)
+
+        assert await cache.get_or_compute("k", working) == ["ok"]
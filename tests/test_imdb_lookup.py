@@ -3,15 +3,22 @@
 Run with: pytest tests/test_imdb_lookup.py -v
 """
 import pytest
+import asyncio
 import os
 import sys
 from unittest.mock import patch, AsyncMock
+from cachetools import TLRUCache
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from imdb_lookup import lookup_imdb_id, batch_lookup_imdb_ids, is_lookup_enabled, get_api_status
-from imdb_cache import get_cached_imdb_id, set_cached_imdb_id, clear_cache, get_cache_stats
+from imdb_cache import (
+    get_cached_imdb_id, set_cached_imdb_id, get_cached_imdb_data,
+    clear_cache, get_cache_stats
+)
+from imdb_lookup import lookup_imdb_data
+import imdb_cache
 
 
 @pytest.fixture(autouse=True)
@@ -86,6 +93,39 @@ class TestIMDbCache:
         
         stats = get_cache_stats()
         assert stats["size"] == 2
+    
+    def test_negative_entry_replaced_by_success(self):
+        """Test a cached failed lookup is counted as negative and replaced by a later success."""
+        set_cached_imdb_id("Unknown Movie", 2025, None)
+        stats = get_cache_stats()
+        assert stats["negative_size"] == 1
+        assert "negative_ttl_seconds" in stats
+        
+        # A later successful lookup replaces the negative entry
+        set_cached_imdb_id("Unknown Movie", 2025, "tt0000003")
+        assert get_cached_imdb_id("Unknown Movie", 2025) == "tt0000003"
+        assert get_cache_stats()["negative_size"] == 0
+    
+    def test_negative_entry_expires_after_negative_ttl(self, monkeypatch):
+        """Test failed lookups expire after IMDB_NEG_TTL_SECONDS, found IDs after the full TTL."""
+        now = [0.0]
+        monkeypatch.setattr(imdb_cache, "_imdb_cache", TLRUCache(
+            maxsize=10, ttu=imdb_cache._ttu, timer=lambda: now[0]
+        ))
+        set_cached_imdb_id("Unknown Movie", 2025, None)
+        set_cached_imdb_id("The Matrix", 1999, "tt0133093")
+        
+        now[0] = imdb_cache.IMDB_NEG_TTL_SECONDS - 1
+        assert get_cached_imdb_id("Unknown Movie", 2025) is None
+        
+        now[0] = imdb_cache.IMDB_NEG_TTL_SECONDS + 1
+        with pytest.raises(KeyError):
+            get_cached_imdb_id("Unknown Movie", 2025)
+        assert get_cached_imdb_id("The Matrix", 1999) == "tt0133093"
+        
+        now[0] = imdb_cache.IMDB_CACHE_TTL_SECONDS + 1
+        with pytest.raises(KeyError):
+            get_cached_imdb_id("The Matrix", 1999)
 
 
 class TestIMDbLookup:
@@ -123,7 +163,7 @@ class TestIMDbLookup:
     async def test_lookup_caches_result(self, mock_tmdb_api_key):
         """Test that successful lookup caches the result."""
         with patch('imdb_lookup._search_movie_tmdb', return_value=603):
-            with patch('imdb_lookup._get_imdb_id_from_tmdb', return_value="tt0133093"):
+            with patch('imdb_lookup._get_movie_bundle', return_value={"imdb_id": "tt0133093"}):
                 result = await lookup_imdb_id("The Matrix", 1999)
                 assert result == "tt0133093"
                 
@@ -131,6 +171,22 @@ class TestIMDbLookup:
                 cached = get_cached_imdb_id("The Matrix", 1999)
                 assert cached == "tt0133093"
     
+    @pytest.mark.asyncio
+    async def test_lookup_caches_poster(self, mock_tmdb_api_key):
+        """Test that a warm lookup returns the cached poster without API calls."""
+        bundle = {"imdb_id": "tt0133093", "poster_path": "/matrix.jpg"}
+        with patch('imdb_lookup._search_movie_tmdb', return_value=603):
+            with patch('imdb_lookup._get_movie_bundle', return_value=bundle):
+                first = await lookup_imdb_data("The Matrix", 1999)
+        
+        with patch('imdb_lookup._search_movie_tmdb') as mock_search:
+            second = await lookup_imdb_data("The Matrix", 1999)
+            mock_search.assert_not_called()
+        
+        assert first == second
+        assert second["poster_url"] == "https://image.tmdb.org/t/p/w500/matrix.jpg"
+        assert get_cached_imdb_data("The Matrix", 1999) == second
+    
     @pytest.mark.asyncio
     async def test_lookup_caches_failure(self, mock_tmdb_api_key):
         """Test that failed lookup is also cached (to avoid repeated API calls)."""
@@ -142,6 +198,25 @@ class TestIMDbLookup:
             cached = get_cached_imdb_id("Nonexistent Movie XYZ", 2025)
             assert cached is None
     
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_request(self, mock_tmdb_api_key):
+        """Test that concurrent lookups of one title hit TMDB only once."""
+        async def slow_search(title, year, language):
+            await asyncio.sleep(0.05)
+            return 603
+        
+        with patch('imdb_lookup._search_movie_tmdb', side_effect=slow_search) as mock_search:
+            with patch('imdb_lookup._get_movie_bundle', return_value={"imdb_id": "tt0133093"}):
+                results = await asyncio.gather(
+                    lookup_imdb_id("The Matrix", 1999),
+                    lookup_imdb_id("the matrix ", 1999),
+                    lookup_imdb_data("The Matrix", 1999),
+                )
+        
+        assert mock_search.call_count == 1
+        assert results[0] == results[1] == "tt0133093"
+        assert results[2]["imdb_id"] == "tt0133093"
+    
     @pytest.mark.asyncio
     async def test_batch_lookup(self, mock_tmdb_api_key):
         """Test batch lookup functionality."""
@@ -160,15 +235,15 @@ class TestIMDbLookup:
             else:
                 return None
         
-        def mock_get_imdb(tmdb_id):
+        def mock_get_bundle(tmdb_id):
             if tmdb_id == 603:
-                return "tt0133093"
+                return {"external_ids": {"imdb_id": "tt0133093"}}
             elif tmdb_id == 27205:
-                return "tt1375666"
+                return {"external_ids": {"imdb_id": "tt1375666"}}
             return None
         
         with patch('imdb_lookup._search_movie_tmdb', side_effect=mock_search):
-            with patch('imdb_lookup._get_imdb_id_from_tmdb', side_effect=mock_get_imdb):
+            with patch('imdb_lookup._get_movie_bundle', side_effect=mock_get_bundle):
                 results = await batch_lookup_imdb_ids(movies)
                 
                 assert results["The Matrix"] == "tt0133093"
@@ -206,14 +281,17 @@ class TestIMDbLookupIntegration:
             ]
         }
         
-        mock_external_ids_response = {
-            "imdb_id": "tt0133093"
+        # Details with external IDs appended (append_to_response=external_ids)
+        mock_bundle_response = {
+            "id": 603,
+            "poster_path": "/matrix.jpg",
+            "external_ids": {"imdb_id": "tt0133093"}
         }
         
         with patch('imdb_lookup._rate_limited_request') as mock_request:
             mock_request.side_effect = [
                 mock_search_response,
-                mock_external_ids_response
+                mock_bundle_response
             ]
             
             result = await lookup_imdb_id("The Matrix", 1999)
@@ -228,7 +306,7 @@ class TestIMDbLookupIntegration:
         mock_responses = [
             {"results": []},  # Hungarian search - no results
             {"results": [{"id": 603}]},  # English search - found
-            {"imdb_id": "tt0133093"}  # External IDs
+            {"external_ids": {"imdb_id": "tt0133093"}}  # Details + external IDs
         ]
         
         with patch('imdb_lookup._rate_limited_request') as mock_request:
@@ -236,7 +314,7 @@ class TestIMDbLookupIntegration:
             
             result = await lookup_imdb_id("Mátrix", 1999)
             assert result == "tt0133093"
-            # Should make 3 calls: HU search, EN search, external IDs
+            # Should make 3 calls: HU search, EN search, details bundle
             assert mock_request.call_count == 3
 
 
@@ -5,6 +5,7 @@ Run with: pytest tests/test_scraper_refactor.py -v
 """
 import pytest
 import asyncio
+import httpx
 from src.scraper import MusorTvScraper, get_scraper, fetch_live_movies, cleanup_scraper
 
 
@@ -14,7 +15,7 @@ class TestScraperRefactoring:
     @pytest.mark.asyncio
     async def test_scraper_initialization(self):
         """Test that scraper initializes and cleans up properly."""
-        scraper = MusorTvScraper(rate_limit_ms=1000)
+        scraper = MusorTvScraper(rate_limit_ms=1000, backend="playwright")
         
         # Should not be initialized yet
         assert scraper._browser is None
@@ -30,6 +31,18 @@ class TestScraperRefactoring:
         assert scraper._browser is None
         assert scraper._playwright is None
     
+    @pytest.mark.asyncio
+    async def test_http_backend_initialization(self):
+        """Test that the default HTTP backend uses a client, not a browser."""
+        scraper = MusorTvScraper(rate_limit_ms=1000, backend="http")
+        
+        await scraper.initialize()
+        assert scraper._client is not None
+        assert scraper._browser is None
+        
+        await scraper.cleanup()
+        assert scraper._client is None
+    
     @pytest.mark.asyncio
     async def test_scraper_thread_safety(self):
         """Test that concurrent fetches are handled safely."""
@@ -77,15 +90,79 @@ class TestScraperRefactoring:
         finally:
             await scraper.cleanup()
     
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Test that a stale listing is served while refreshing in background."""
+        scraper = MusorTvScraper(rate_limit_ms=0, backend="http")
+        calls = 0
+        
+        async def fake_fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return [f"scrape-{calls}"]
+        
+        scraper._fetch = fake_fetch
+        
+        # Cold start waits for the scrape
+        assert await scraper.fetch_live_movies() == ["scrape-1"]
+        
+        # Warm: previous result is returned immediately, refresh runs behind it
+        assert await scraper.fetch_live_movies() == ["scrape-1"]
+        assert await scraper.fetch_live_movies() == ["scrape-1"]  # Refresh already in flight
+        await scraper._in_flight_task
+        
+        assert calls == 2
+        assert await scraper.fetch_live_movies() == ["scrape-2"]
+        await scraper._in_flight_task
+    
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_listing(self):
+        """Test that a refresh where every page fails keeps the previous listing."""
+        scraper = MusorTvScraper(rate_limit_ms=0, backend="http")
+        scraper._cached_result = ["stale"]
+        scraper._index = {("ch", "1", "t"): "stale"}
+        
+        async def failing_page(url):
+            raise httpx.ConnectError("network down")
+        
+        scraper._scrape_page_http = failing_page
+        
+        try:
+            # Stale listing is served and the refresh runs behind it
+            assert await scraper.fetch_live_movies() == ["stale"]
+            with pytest.raises(RuntimeError):
+                await scraper._in_flight_task
+            
+            assert scraper._cached_result == ["stale"]
+            assert scraper._index == {("ch", "1", "t"): "stale"}
+            assert scraper._consecutive_error_count == 1
+            assert await scraper.fetch_live_movies() == ["stale"]
+        finally:
+            await scraper.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_cancels_background_refresh(self):
+        """Test that cleanup stops a pending refresh before it can reopen the client."""
+        scraper = MusorTvScraper(rate_limit_ms=0, backend="http")
+        scraper._cached_result = ["stale"]
+        
+        assert await scraper.fetch_live_movies() == ["stale"]
+        task = scraper._in_flight_task
+        await scraper.cleanup()
+        
+        assert task.cancelled()
+        assert scraper._client is None
+    
     @pytest.mark.asyncio
     async def test_singleton_pattern(self):
         """Test that get_scraper() returns singleton instance."""
         scraper1 = await get_scraper()
         scraper2 = await get_scraper()
         
-        # Should be the same instance
+        # Should be the same instance, initialized lazily on first scrape
         assert scraper1 is scraper2
-        assert scraper1._browser is not None
+        assert scraper1._client is None and scraper1._browser is None
         
         # Cleanup
         await cleanup_scraper()
@@ -105,7 +182,7 @@ class TestScraperRefactoring:
     @pytest.mark.asyncio
     async def test_multiple_initializations(self):
         """Test that multiple initialize calls don't create multiple browsers."""
-        scraper = MusorTvScraper()
+        scraper = MusorTvScraper(backend="playwright")
         
         await scraper.initialize()
         browser1 = scraper._browser
@@ -121,7 +198,7 @@ class TestScraperRefactoring:
     @pytest.mark.asyncio
     async def test_cleanup_idempotent(self):
         """Test that cleanup can be called multiple times safely."""
-        scraper = MusorTvScraper()
+        scraper = MusorTvScraper(backend="playwright")
         await scraper.initialize()
         
         # First cleanup
@@ -193,6 +270,87 @@ class TestScraperHelperMethods:
         assert len(result) == 2
         assert result[0].title == "Movie 1"
         assert result[1].title == "Movie 2"
+    
+    @pytest.mark.asyncio
+    async def test_scrape_page_http_parses_show_events(self):
+        """Test HTTP backend extracts fields from server-rendered markup."""
+        html = """
+        <table class="showeventtable"><tr>
+          <td class="showeventchannel"><img alt=" RTL "></td>
+          <td class="showeventtime">2025.10.18 22:30</td>
+          <td class="showeventtitle"><a href="/x">  Fekete   kutya </a></td>
+          <td itemprop="description">akciófilm, 2019</td>
+          <td><img class="showeventimg" src="/img/fk.jpg"></td>
+        </tr></table>
+        <table class="showeventtable"><tr>
+          <td class="showeventtitle"><a href="/y">No channel or time</a></td>
+        </tr></table>
+        """
+        scraper = MusorTvScraper(rate_limit_ms=1000, backend="http")
+        scraper._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text=html))
+        )
+        
+        try:
+            movies = await scraper._scrape_page_http("https://musor.tv/filmek")
+        finally:
+            await scraper.cleanup()
+        
+        assert len(movies) == 1
+        assert movies[0].title == "Fekete kutya"
+        assert movies[0].channel == "RTL"
+        assert movies[0].category == "akciófilm, 2019"
+        assert movies[0].poster == "https://musor.tv/img/fk.jpg"
+        assert movies[0].start_iso.startswith("2025-10-18T22:30")
+    
+    @pytest.mark.asyncio
+    async def test_scrape_page_http_conditional_get(self):
+        """Test a 304 reuses the previous parse instead of reparsing."""
+        html = """
+        <table class="showeventtable"><tr>
+          <td class="showeventchannel"><img alt="RTL"></td>
+          <td class="showeventtime">2025.10.18 22:30</td>
+          <td class="showeventtitle"><a href="/x">Fekete kutya</a></td>
+        </tr></table>
+        """
+        seen_headers = []
+        
+        def handler(request):
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=html, headers={"ETag": '"v1"'})
+        
+        scraper = MusorTvScraper(rate_limit_ms=1000, backend="http")
+        scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        
+        try:
+            first = await scraper._scrape_page_http("https://musor.tv/filmek")
+            second = await scraper._scrape_page_http("https://musor.tv/filmek")
+        finally:
+            await scraper.cleanup()
+        
+        assert seen_headers == [None, '"v1"']
+        assert second is first
+        assert second[0].title == "Fekete kutya"
+    
+    def test_build_index(self):
+        """Test meta ID index is keyed by channel, timestamp and title slugs."""
+        from src.models import LiveMovieRaw
+        
+        movie = LiveMovieRaw(
+            title="Fekete kutya",
+            start_iso="2025-10-20T10:40:00+00:00",
+            channel="Mozi+ HD",
+            category="Film",
+            poster=None
+        )
+        
+        scraper = MusorTvScraper(rate_limit_ms=1000)
+        scraper._index = MusorTvScraper._build_index([movie])
+        
+        assert scraper.get_by_key(("mozi-hd", "1760956800", "fekete-kutya")) is movie
+        assert scraper.get_by_key(("mozi-hd", "1760956801", "fekete-kutya")) is None
 
 
 if __name__ == "__main__":
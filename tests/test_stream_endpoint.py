@@ -1,81 +1,116 @@
 """Tests for stream endpoint functionality."""
+import asyncio
+import httpx
+import orjson
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 from main import app
 
 
-client = TestClient(app)
+@pytest_asyncio.fixture
+async def aclient():
+    """In-process async client; requests stay on the test's event loop."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://testserver",
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    ) as c:
+        yield c
 
 
-def test_stream_endpoint_exists():
+@pytest.fixture(scope="session")
+def manifest():
+    """Decoded /manifest.json, fetched once since it is static for the process."""
+    async def _fetch():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as c:
+            response = await c.get("/manifest.json")
+            assert response.status_code == 200
+            return orjson.loads(response.content)
+
+    return asyncio.run(_fetch())
+
+
+async def _get_json(aclient, path):
+    """GET a path and return (status code, decoded body or None if empty)."""
+    response = await aclient.get(path)
+    return response.status_code, orjson.loads(response.content) if response.content else None
+
+
+async def _get_many(aclient, paths):
+    """GET several paths concurrently over the shared client."""
+    return await asyncio.gather(*(aclient.get(p) for p in paths))
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_exists(aclient):
     """Test that the stream endpoint exists and returns 200."""
-    response = client.get("/stream/movie/musortv:rtl:1234567890:test.json")
+    response = await aclient.get("/stream/movie/musortv:rtl:1234567890:test.json")
     assert response.status_code == 200
 
 
-def test_stream_endpoint_returns_empty_streams():
+@pytest.mark.asyncio
+async def test_stream_endpoint_returns_empty_streams(aclient):
     """Test that the stream endpoint returns empty streams array."""
-    response = client.get("/stream/movie/musortv:rtl:1234567890:test.json")
-    data = response.json()
+    _, data = await _get_json(aclient, "/stream/movie/musortv:rtl:1234567890:test.json")
     assert "streams" in data
     assert data["streams"] == []
 
 
-def test_stream_endpoint_validates_id_format():
+@pytest.mark.asyncio
+async def test_stream_endpoint_validates_id_format(aclient):
     """Test that invalid ID format still returns empty streams (not error)."""
-    response = client.get("/stream/movie/invalid-id-format.json")
-    assert response.status_code == 200
-    data = response.json()
+    status, data = await _get_json(aclient, "/stream/movie/invalid-id-format.json")
+    assert status == 200
     assert data["streams"] == []
 
 
-def test_stream_endpoint_with_valid_musortv_id():
+@pytest.mark.asyncio
+async def test_stream_endpoint_with_valid_musortv_id(aclient):
     """Test stream endpoint with properly formatted musor.tv ID."""
     # Format: musortv:channel:timestamp:title-slug
     valid_id = "musortv:rtl:1729372800:matrix"
-    response = client.get(f"/stream/movie/{valid_id}.json")
-    assert response.status_code == 200
-    data = response.json()
+    status, data = await _get_json(aclient, f"/stream/movie/{valid_id}.json")
+    assert status == 200
     assert data["streams"] == []
 
 
-def test_manifest_includes_stream_resource():
+def test_manifest_includes_stream_resource(manifest):
     """Test that the manifest declares stream resource."""
-    response = client.get("/manifest.json")
-    assert response.status_code == 200
-    manifest = response.json()
     assert "resources" in manifest
     assert "catalog" in manifest["resources"]
     assert "stream" in manifest["resources"]
 
 
-def test_stream_endpoint_different_types():
+@pytest.mark.asyncio
+async def test_stream_endpoint_different_types(aclient):
     """Test stream endpoint with different content types."""
-    # Movie
-    response = client.get("/stream/movie/musortv:rtl:1234567890:test.json")
-    assert response.status_code == 200
-    assert response.json()["streams"] == []
-    
-    # Series (even though we don't use it, endpoint should handle it)
-    response = client.get("/stream/series/musortv:rtl:1234567890:test.json")
-    assert response.status_code == 200
-    assert response.json()["streams"] == []
+    # Movie, and series (even though we don't use it, endpoint should handle it)
+    responses = await _get_many(aclient, [
+        "/stream/movie/musortv:rtl:1234567890:test.json",
+        "/stream/series/musortv:rtl:1234567890:test.json",
+    ])
+    for response in responses:
+        assert response.status_code == 200
+        assert orjson.loads(response.content)["streams"] == []
 
 
-def test_stream_response_content_type():
+@pytest.mark.asyncio
+async def test_stream_response_content_type(aclient):
     """Test that stream endpoint returns JSON content type."""
-    response = client.get("/stream/movie/musortv:rtl:1234567890:test.json")
+    response = await aclient.get("/stream/movie/musortv:rtl:1234567890:test.json")
     assert response.status_code == 200
     assert "application/json" in response.headers["content-type"]
 
 
 @pytest.mark.asyncio
-async def test_stream_endpoint_logs_request(caplog):
+async def test_stream_endpoint_logs_request(aclient, caplog):
     """Test that stream requests are logged for debugging."""
     import logging
     caplog.set_level(logging.INFO)
     
-    response = client.get("/stream/movie/musortv:rtl:1234567890:test.json")
+    response = await aclient.get("/stream/movie/musortv:rtl:1234567890:test.json")
     assert response.status_code == 200
     
     # Check that the request was logged
@@ -83,11 +118,11 @@ async def test_stream_endpoint_logs_request(caplog):
     assert any("Stream request" in msg for msg in log_messages)
 
 
-def test_stream_endpoint_handles_percent_encoded_id():
+@pytest.mark.asyncio
+async def test_stream_endpoint_handles_percent_encoded_id(aclient):
     """IDs may be percent-encoded by some clients; endpoint should still work."""
     # ':' encoded as %3A in multiple places
     encoded_id = "musortv%3Aamc-hd%3A1760950200%3Aelatkozott-ella"
-    response = client.get(f"/stream/movie/{encoded_id}.json")
-    assert response.status_code == 200
-    data = response.json()
+    status, data = await _get_json(aclient, f"/stream/movie/{encoded_id}.json")
+    assert status == 200
     assert data["streams"] == []